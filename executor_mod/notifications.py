@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
+import queue
+import threading
 import time
 from contextlib import suppress
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+from executor_mod import json_codec
+
 
 def _get_int(name: str, default: int) -> int:
     try:
@@ -17,14 +21,35 @@ def _get_int(name: str, default: int) -> int:
         return default
 
 
+def _get_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
 ENV: Dict[str, Any] = {
     "EXEC_LOG": os.getenv("EXEC_LOG", "/data/logs/executor.log"),
     "LOG_MAX_LINES": _get_int("LOG_MAX_LINES", 200),
+    # 0 = flush every line; >0 = block-buffered, flushed at most this often (and at exit)
+    "LOG_FLUSH_SEC": _get_float("LOG_FLUSH_SEC", 0.0),
     "N8N_WEBHOOK_URL": os.getenv("N8N_WEBHOOK_URL", ""),
     "N8N_BASIC_AUTH_USER": os.getenv("N8N_BASIC_AUTH_USER", ""),
     "N8N_BASIC_AUTH_PASSWORD": os.getenv("N8N_BASIC_AUTH_PASSWORD", ""),
+    # 1 = POST webhooks from a background thread via a bounded queue (drop + log when full)
+    "WEBHOOK_ASYNC": os.getenv("WEBHOOK_ASYNC", "0").strip().lower() in ("1", "true", "yes", "y", "on"),
 }
 
+_LOG_FH: Dict[str, Any] = {}
+_LOG_LINES: Dict[str, int] = {}
+_LOG_FLUSHED_AT: Dict[str, float] = {}
+_LOG_PENDING: Dict[str, List[str]] = {}  # lines not yet written (LOG_FLUSH_SEC > 0)
+_LOG_LOCK = threading.RLock()
+_WEBHOOK_SESSION: Optional[requests.Session] = None
+_WH_Q_MAX = 128
+_WH_Q: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=_WH_Q_MAX)
+_WH_THREAD: Optional[threading.Thread] = None
+
 _SNAPSHOT_OK_STATE: Dict[Tuple[str, str], bool] = {}
 _SNAPSHOT_LAST_ERR_TS: Dict[Tuple[str, str, str], float] = {}
 _SNAPSHOT_ERR_THROTTLE_SEC = float(os.getenv("SNAPSHOT_ERR_THROTTLE_SEC", "60"))
@@ -40,19 +65,100 @@ def _ensure_dir(path: str) -> None:
         os.makedirs(d, exist_ok=True)
 
 
-def append_line_with_cap(path: str, line: str, cap: int) -> None:
+def _count_lines(path: str) -> int:
+    n = 0
+    with suppress(FileNotFoundError):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                n += chunk.count(b"\n")
+    return n
+
+
+def _flush_sec() -> float:
+    try:
+        return float(ENV.get("LOG_FLUSH_SEC") or 0.0)
+    except Exception:
+        return 0.0
+
+
+def flush_logs() -> None:
+    """Write out buffered log lines (LOG_FLUSH_SEC > 0); registered with atexit."""
+    with _LOG_LOCK:
+        for path in list(_LOG_PENDING):
+            with suppress(Exception):
+                _flush_pending(path)
+
+
+atexit.register(flush_logs)
+
+
+def _log_handle(path: str) -> Any:
+    """Long-lived append handle per path; reopened if the file was replaced or removed.
+
+    Only called when lines are written out, so the rotation check runs once per flush,
+    not once per line. The file's line count is taken on (re)open and then tracked in memory.
+    """
+    fh = _LOG_FH.get(path)
+    if fh is not None and not fh.closed:
+        try:
+            if os.stat(path).st_ino == os.fstat(fh.fileno()).st_ino:
+                return fh
+        except OSError:
+            pass
+        with suppress(Exception):
+            fh.close()
     _ensure_dir(path)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(line.rstrip("\n") + "\n")
+    fh = open(path, "a", encoding="utf-8")
+    _LOG_FH[path] = fh
+    _LOG_LINES[path] = _count_lines(path)
+    return fh
+
+
+def _flush_pending(path: str) -> None:
+    """Write pending lines to the current file at path (caller holds _LOG_LOCK).
+
+    Lines are buffered in memory rather than in the file object, so a rotation or unlink
+    detected here sends them to the new file instead of the old inode.
+    """
+    fh = _log_handle(path)
+    pending = _LOG_PENDING.pop(path, None)
+    if pending:
+        fh.write("".join(pending))
+        fh.flush()
+        _LOG_LINES[path] = _LOG_LINES.get(path, 0) + len(pending)
+    _LOG_FLUSHED_AT[path] = time.monotonic()
+
+
+def append_line_with_cap(path: str, line: str, cap: int) -> None:
+    # The webhook worker thread logs too; keep append/trim of one file serialized.
+    with _LOG_LOCK:
+        _append_line_with_cap(path, line, cap)
+
 
+def _append_line_with_cap(path: str, line: str, cap: int) -> None:
+    _LOG_PENDING.setdefault(path, []).append(line.rstrip("\n") + "\n")
+    flush_sec = _flush_sec()
+    last = _LOG_FLUSHED_AT.get(path)
+    if flush_sec <= 0 or last is None or time.monotonic() - last >= flush_sec:
+        _flush_pending(path)
+
+    # Hard cap: on exceeding cap, trim to the newest ~3/4 so the file is rewritten once per
+    # cap/4 events instead of on every event once full, and never holds more than cap lines.
+    if cap <= 0 or _LOG_LINES.get(path, 0) + len(_LOG_PENDING.get(path, ())) <= cap:
+        return
+    _flush_pending(path)  # the trim re-reads the file
     try:
         with open(path, "r", encoding="utf-8") as f:
             lines = f.readlines()
-        if len(lines) > cap:
-            with open(path, "w", encoding="utf-8") as f:
-                f.writelines(lines[-cap:])
+        keep = lines[-max(1, cap * 3 // 4):]
+        # Swap in the trimmed copy atomically so tailers never see a half-written log.
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(keep)
+        os.replace(tmp, path)
+        _LOG_LINES[path] = len(keep)
     except FileNotFoundError:
-        pass
+        _LOG_LINES[path] = 0
 
 
 def _should_log_snapshot_refresh(action: str, fields: Dict[str, Any]) -> bool:
@@ -89,11 +195,56 @@ def log_event(action: str, **fields: Any) -> None:
         return
     obj = {"ts": iso_utc(), "source": "executor", "action": action}
     obj.update(fields)
-    append_line_with_cap(
-        ENV["EXEC_LOG"],
-        json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str),
-        ENV["LOG_MAX_LINES"],
-    )
+    append_line_with_cap(ENV["EXEC_LOG"], json_codec.dumps(obj), ENV["LOG_MAX_LINES"])
+
+
+def _webhook_session() -> requests.Session:
+    """Shared keep-alive session so repeated webhooks skip the TCP/TLS handshake."""
+    global _WEBHOOK_SESSION
+    if _WEBHOOK_SESSION is None:
+        _WEBHOOK_SESSION = requests.Session()
+    return _WEBHOOK_SESSION
+
+
+def _post_webhook(url: str, payload: Dict[str, Any]) -> None:
+    try:
+        auth = None
+        if ENV["N8N_BASIC_AUTH_USER"] and ENV["N8N_BASIC_AUTH_PASSWORD"]:
+            auth = (ENV["N8N_BASIC_AUTH_USER"], ENV["N8N_BASIC_AUTH_PASSWORD"])
+        _webhook_session().post(url, json=payload, timeout=5, auth=auth)
+    except Exception as e:
+        log_event("WEBHOOK_ERROR", error=str(e), payload=payload)
+
+
+def _webhook_worker() -> None:
+    while True:
+        item = _WH_Q.get()
+        try:
+            if item is None:
+                return
+            _post_webhook(item["url"], item["payload"])
+        finally:
+            _WH_Q.task_done()
+
+
+def _ensure_webhook_worker() -> None:
+    global _WH_THREAD
+    if _WH_THREAD is None or not _WH_THREAD.is_alive():
+        _WH_THREAD = threading.Thread(target=_webhook_worker, name="webhook", daemon=True)
+        _WH_THREAD.start()
+
+
+def flush_webhooks(timeout: float = 5.0) -> None:
+    """Wait (bounded) for queued webhooks to be posted; registered with atexit."""
+    t = _WH_THREAD
+    if t is None or not t.is_alive():
+        return
+    with suppress(queue.Full):
+        _WH_Q.put(None, timeout=timeout)
+    t.join(timeout)
+
+
+atexit.register(flush_webhooks)
 
 
 def send_webhook(payload: Dict[str, Any]) -> None:
@@ -104,13 +255,16 @@ def send_webhook(payload: Dict[str, Any]) -> None:
     payload = dict(payload)
     payload.setdefault("source", "executor")
 
+    if not ENV.get("WEBHOOK_ASYNC"):
+        _post_webhook(url, payload)
+        return
+
+    # Off the manage path: a slow endpoint must not stall the tick.
+    _ensure_webhook_worker()
     try:
-        auth = None
-        if ENV["N8N_BASIC_AUTH_USER"] and ENV["N8N_BASIC_AUTH_PASSWORD"]:
-            auth = (ENV["N8N_BASIC_AUTH_USER"], ENV["N8N_BASIC_AUTH_PASSWORD"])
-        requests.post(url, json=payload, timeout=5, auth=auth)
-    except Exception as e:
-        log_event("WEBHOOK_ERROR", error=str(e), payload=payload)
+        _WH_Q.put_nowait({"url": url, "payload": payload})
+    except queue.Full:
+        log_event("WEBHOOK_DROPPED", reason="queue_full", maxsize=_WH_Q_MAX, payload=payload)
 
 
 def _extract_trade_key(st: Dict[str, Any], pos: Dict[str, Any]) -> Optional[str]:
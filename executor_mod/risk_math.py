@@ -6,6 +6,7 @@ IMPORTANT: This module is a mechanical extraction. Do not change logic without t
 from __future__ import annotations
 
 from decimal import Decimal, ROUND_HALF_UP, ROUND_FLOOR, ROUND_CEILING
+from functools import lru_cache
 from typing import Any, Dict, Tuple
 
 ENV: Dict[str, Any] = {}
@@ -14,18 +15,23 @@ def configure(env: Dict[str, Any]) -> None:
     global ENV
     ENV = env
 
+@lru_cache(maxsize=32)
+def _step_decimal(step: Any) -> Decimal:
+    """Decimal(str(step)), memoized: steps are a handful of fixed TICK_SIZE/QTY_STEP values."""
+    return Decimal(str(step))
+
 def floor_to_step(x: float, step: Decimal) -> float:
-    step_d = Decimal(str(step))
+    step_d = _step_decimal(step)
     units = (Decimal(str(x)) / step_d).to_integral_value(rounding=ROUND_FLOOR)
     return float(units * step_d)
 
 def ceil_to_step(x: float, step: Decimal) -> float:
-    step_d = Decimal(str(step))
+    step_d = _step_decimal(step)
     units = (Decimal(str(x)) / step_d).to_integral_value(rounding=ROUND_CEILING)
     return float(units * step_d)
 
 def round_nearest_to_step(x: float, step: Decimal) -> float:
-    step_d = Decimal(str(step))
+    step_d = _step_decimal(step)
     units = (Decimal(str(x)) / step_d).to_integral_value(rounding=ROUND_HALF_UP)
     return float(units * step_d)
 
@@ -34,14 +40,33 @@ def _decimals_from_step(step: Decimal) -> int:
     step = Decimal(step)
     return max(0, -step.as_tuple().exponent)
 
+@lru_cache(maxsize=32)
+def _step_scaled(step: Any) -> Tuple[int, int]:
+    """(decimals, step expressed as an integer number of 10**-decimals units)."""
+    step_d = _step_decimal(step)
+    dp = _decimals_from_step(step_d)
+    return dp, int(step_d.scaleb(dp))
+
+# ENV key -> (step object, decimals); recomputed only when the ENV value is replaced.
+_ENV_DP: Dict[str, Tuple[Any, int]] = {}
+
+def _env_decimals(key: str) -> int:
+    step = ENV[key]
+    cached = _ENV_DP.get(key)
+    if cached is not None and cached[0] is step:
+        return cached[1]
+    dp = _decimals_from_step(step)
+    _ENV_DP[key] = (step, dp)
+    return dp
+
 def fmt_price(p: float) -> str:
     """Format price as a string respecting TICK_SIZE."""
-    dp = _decimals_from_step(ENV["TICK_SIZE"])
+    dp = _env_decimals("TICK_SIZE")
     return f"{p:.{dp}f}"
 
 def fmt_qty(q: float) -> str:
     """Format quantity as a string respecting QTY_STEP (trim trailing zeros)."""
-    dp = _decimals_from_step(ENV["QTY_STEP"])
+    dp = _env_decimals("QTY_STEP")
     s = f"{q:.{dp}f}"
     return s.rstrip("0").rstrip(".") if "." in s else s
 
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import os
-import json
 import time
 from contextlib import suppress
 from typing import Any, Dict
 
+from executor_mod import json_codec
+
 
 def _ensure_dir(path: str) -> None:
     d = os.path.dirname(path)
@@ -22,8 +23,8 @@ def _state_fn() -> str:
 def load_state() -> Dict[str, Any]:
     fn = _state_fn()
     try:
-        with open(fn, "r", encoding="utf-8") as f:
-            st = json.load(f)
+        with open(fn, "rb") as f:
+            st = json_codec.loads(f.read())
     except FileNotFoundError:
         st = {}
     except Exception:
@@ -50,7 +51,7 @@ def save_state(st: Dict[str, Any]) -> None:
     _ensure_dir(fn)
     tmp = fn + ".tmp"
     with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(st, f, ensure_ascii=False, separators=(",", ":"), default=str)
+        f.write(json_codec.dumps(st))
     os.replace(tmp, fn)
 
 
@@ -3,10 +3,13 @@
 """trail.py
 Trailing helper logic extracted from executor.py.
 
-Hard rule: moved functions below are verbatim copies from executor.py.
+Originally verbatim copies; the aggregated.csv header check and the swing stop are now
+cached per file version and the tail readers share _parse_agg_tail_column. Return values
+are unchanged.
 """
 from contextlib import suppress
 import csv
+import os
 from collections import deque
 from typing import Any, Dict, List, Optional, Callable
 ENV: Dict[str, Any] = {}
@@ -33,7 +36,26 @@ def _norm_col(c: str) -> str:
     return (c or "").replace("\ufeff", "").strip()
 
 
+# (path, st_dev, st_ino, st_mtime_ns) of the last file whose header passed the check.
+_AGG_HEADER_OK_KEY: Optional[tuple] = None
+
+
 def _assert_agg_header_v2(path: str) -> None:
+    """FAIL-LOUD v2 header check, re-run only when the file identity/mtime changes.
+
+    The trail path tails aggregated.csv several times per manage tick; the header
+    only needs re-validating after the producer has touched the file.
+    """
+    global _AGG_HEADER_OK_KEY
+    st = os.stat(path)
+    key = (path, st.st_dev, st.st_ino, st.st_mtime_ns)
+    if key == _AGG_HEADER_OK_KEY:
+        return
+    _check_agg_header_v2(path)
+    _AGG_HEADER_OK_KEY = key
+
+
+def _check_agg_header_v2(path: str) -> None:
     with open(path, "r", encoding="utf-8-sig", newline="") as f:
         reader = csv.reader(f)
         header = next(reader, None)
@@ -49,6 +71,24 @@ def _assert_agg_header_v2(path: str) -> None:
         )
 
 
+_AGG_COMMAS = len(AGG_HEADER_V2) - 1
+
+
+def _parse_agg_tail_column(lines: List[str], idx: int, out: Any) -> None:
+    """Append float(column idx) of each well-formed tail row to `out`.
+
+    Rows with the wrong field count, the header row and unparsable values are
+    skipped. float() tolerates surrounding whitespace, so fields are not stripped.
+    """
+    for ln in lines:
+        if ln.count(",") != _AGG_COMMAS:
+            continue
+        try:
+            out.append(float(ln.split(",")[idx]))
+        except ValueError:
+            continue
+
+
 def configure(
     env: Dict[str, Any],
     read_tail_lines_fn: Callable[[str, int], List[str]],
@@ -93,17 +133,7 @@ def _read_last_close_prices_from_agg_csv(path: str, n_rows: int) -> list[float]:
         except FileNotFoundError:
             # race: file rotated/deleted between tail read and header check
             return []
-        for ln in lines:
-            ln = ln.strip()
-            if not ln or ln.startswith("Timestamp"):
-                continue
-            parts = [p.strip() for p in ln.split(",")]
-            if len(parts) != len(AGG_HEADER_V2):
-                continue
-            try:
-                closes.append(float(parts[close_idx]))
-            except Exception:
-                continue
+        _parse_agg_tail_column(lines, close_idx, closes)
     else:
         try:
             _assert_agg_header_v2(path)
@@ -144,17 +174,7 @@ def _read_last_low_prices_from_agg_csv(path: str, n_rows: int) -> list[float]:
             _assert_agg_header_v2(path)
         except FileNotFoundError:
             return []
-        for ln in lines:
-            ln = ln.strip()
-            if not ln or ln.startswith("Timestamp"):
-                continue
-            parts = [p.strip() for p in ln.split(",")]
-            if len(parts) != len(AGG_HEADER_V2):
-                continue
-            try:
-                lows.append(float(parts[low_idx]))
-            except Exception:
-                continue
+        _parse_agg_tail_column(lines, low_idx, lows)
     else:
         try:
             _assert_agg_header_v2(path)
@@ -195,17 +215,7 @@ def _read_last_high_prices_from_agg_csv(path: str, n_rows: int) -> list[float]:
             _assert_agg_header_v2(path)
         except FileNotFoundError:
             return []
-        for ln in lines:
-            ln = ln.strip()
-            if not ln or ln.startswith("Timestamp"):
-                continue
-            parts = [p.strip() for p in ln.split(",")]
-            if len(parts) != len(AGG_HEADER_V2):
-                continue
-            try:
-                highs.append(float(parts[high_idx]))
-            except Exception:
-                continue
+        _parse_agg_tail_column(lines, high_idx, highs)
     else:
         try:
             _assert_agg_header_v2(path)
@@ -309,7 +319,34 @@ def _trail_desired_stop_from_agg(pos: dict) -> Optional[float]:
     lookback = int(ENV.get("TRAIL_SWING_LOOKBACK") or 0)
     lr = int(ENV.get("TRAIL_SWING_LR") or 2)
     buf = float(ENV.get("TRAIL_SWING_BUFFER_USD") or 0.0)
-    if pos.get("side") == "LONG":
+    return _swing_stop_cached(path, pos.get("side"), lookback, lr, buf)
+
+
+# (key, stop) of the last swing-stop computation; key pins the file version and inputs.
+_SWING_STOP_CACHE: Optional[tuple] = None
+
+
+def _swing_stop_cached(path: str, side: Any, lookback: int, lr: int, buf: float) -> Optional[float]:
+    """_swing_stop() memoized on (file identity, mtime_ns, size, side, params).
+
+    aggregated.csv only changes once per bar, while the trail path asks every
+    TRAIL_UPDATE_EVERY_SEC; a missing file is never cached (fail-closed path).
+    """
+    global _SWING_STOP_CACHE
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _swing_stop(path, side, lookback, lr, buf)
+    key = (path, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, side, lookback, lr, buf)
+    if _SWING_STOP_CACHE is not None and _SWING_STOP_CACHE[0] == key:
+        return _SWING_STOP_CACHE[1]
+    stop = _swing_stop(path, side, lookback, lr, buf)
+    _SWING_STOP_CACHE = (key, stop)
+    return stop
+
+
+def _swing_stop(path: str, side: Any, lookback: int, lr: int, buf: float) -> Optional[float]:
+    if side == "LONG":
         series = _read_last_low_prices_from_agg_csv(path, lookback)
         kind = "low"
     else:
@@ -320,7 +357,7 @@ def _trail_desired_stop_from_agg(pos: dict) -> Optional[float]:
     swing = _find_last_fractal_swing(series, lr=lr, kind=kind)
     if swing is None:
         return None
-    if pos.get("side") == "LONG":
+    if side == "LONG":
         return float(swing - buf)
     else:
         return float(swing + buf)
@@ -182,6 +182,75 @@ class TestBinanceApiSmoke(unittest.TestCase):
             self.assertEqual((method, endpoint), ("DELETE", "/api/v3/order"))
             self.assertEqual(params["orderId"], 123)
 
+    def test_signed_request_error_carries_binance_code(self):
+        binance_api.configure(_spot_env())
+        resp = MagicMock(status_code=400, text='{"code":-2011,"msg":"Unknown order sent."}')
+        with patch.object(binance_api, "_do_request", return_value=resp):
+            with self.assertRaises(binance_api.BinanceAPIError) as cm:
+                binance_api.cancel_order("BTCUSDC", 1)
+        self.assertEqual(cm.exception.code, -2011)
+        self.assertEqual(cm.exception.status, 400)
+        self.assertIsInstance(cm.exception, RuntimeError)
+        self.assertTrue(str(cm.exception).startswith("Binance API error: 400 "))
+
+    def test_requests_reuse_one_pooled_session(self):
+        binance_api.configure(_spot_env())
+        sess = MagicMock()
+        sess.get.return_value = MagicMock(status_code=200, text='{"ok":1}', json=lambda: {"ok": 1})
+        with patch.object(binance_api, "_SESSION", sess):
+            self.assertEqual(binance_api.binance_public_get("/api/v3/ping"), {"ok": 1})
+            self.assertEqual(binance_api.binance_public_get("/api/v3/ping"), {"ok": 1})
+            self.assertIs(binance_api._http_session(), sess)
+        self.assertEqual(sess.get.call_count, 2)
+
+        with patch.object(binance_api, "_SESSION", None):
+            first = binance_api._http_session()
+            self.assertIs(binance_api._http_session(), first)
+            self.assertEqual(first.get_adapter("https://api.binance.com")._pool_maxsize, 8)
+
+    def test_cancel_all_open_orders_endpoint_per_mode(self):
+        binance_api.configure(_spot_env())
+        with patch.object(binance_api, "_binance_signed_request", return_value=[{"orderId": 1}]) as signed:
+            self.assertEqual(binance_api.cancel_all_open_orders("BTCUSDC"), [{"orderId": 1}])
+            self.assertEqual(signed.call_args[0], ("DELETE", "/api/v3/openOrders", {"symbol": "BTCUSDC"}))
+
+        _reset_binance_api_globals()
+        binance_api.configure(_margin_env())
+        with patch.object(binance_api, "_binance_signed_request", return_value=[]) as signed:
+            binance_api.cancel_all_open_orders("BTCUSDC")
+            method, endpoint, params = signed.call_args[0]
+            self.assertEqual((method, endpoint), ("DELETE", "/sapi/v1/margin/openOrders"))
+            self.assertEqual(params["symbol"], "BTCUSDC")
+            self.assertIn("isIsolated", params)
+
+    def test_cancel_replace_order_spot_only(self):
+        binance_api.configure(_spot_env())
+        with patch.object(binance_api, "_binance_signed_request") as signed:
+            signed.return_value = {
+                "cancelResult": "SUCCESS",
+                "newOrderResult": "SUCCESS",
+                "newOrderResponse": {"orderId": 555},
+            }
+            res = binance_api.cancel_replace_order("BTCUSDC", 444, {"side": "SELL", "type": "STOP_LOSS_LIMIT"})
+            self.assertEqual(res, {"orderId": 555})
+            method, endpoint, params = signed.call_args[0]
+            self.assertEqual((method, endpoint), ("POST", "/api/v3/order/cancelReplace"))
+            self.assertEqual(params["cancelOrderId"], 444)
+            self.assertEqual(params["cancelReplaceMode"], "STOP_ON_FAILURE")
+            self.assertEqual(params["symbol"], "BTCUSDC")
+
+        with patch.object(binance_api, "_binance_signed_request") as signed:
+            signed.return_value = {"cancelResult": "SUCCESS", "newOrderResult": "FAILURE"}
+            with self.assertRaises(RuntimeError):
+                binance_api.cancel_replace_order("BTCUSDC", 444, {})
+
+        _reset_binance_api_globals()
+        binance_api.configure(_margin_env())
+        with patch.object(binance_api, "_binance_signed_request") as signed:
+            with self.assertRaises(RuntimeError):
+                binance_api.cancel_replace_order("BTCUSDC", 444, {})
+            signed.assert_not_called()
+
     def test_planb_exec_price_uses_bid_or_ask(self):
         binance_api.configure(_spot_env())
         with patch.object(binance_api, "binance_public_get") as pub:
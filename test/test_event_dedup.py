@@ -43,7 +43,7 @@ class TestEventDedup(unittest.TestCase):
         e1 = {"action": "PEAK", "source": "DeltaScout", "kind": "long", "ts": "2025-01-01T12:34:56Z", "price": 100.0}
         e2 = {"action": "PEAK", "source": "DeltaScout", "kind": "short", "ts": "2025-01-01T12:35:10Z", "price": 101.0}
 
-        tail = [json.dumps(e1), json.dumps(e2), json.dumps(e1)]
+        tail = [json.dumps(e1), json.dumps({"action": "HEARTBEAT"}), "{not json", json.dumps(e2), json.dumps(e1)]
         ed.bootstrap_seen_keys_from_tail(st, tail)
 
         self.assertIn("meta", st)
@@ -51,3 +51,61 @@ class TestEventDedup(unittest.TestCase):
         self.assertEqual(len(st["meta"]["seen_keys"]), 2)  # дубль не додається
         self.assertTrue(len(self.saved) >= 1)
         self.assertTrue(any(a == "BOOTSTRAP_SEEN_KEYS" for a, _ in self.logged))
+
+    def test_seen_keys_evicts_oldest_in_order(self):
+        seen = ed.SeenKeys(["a", "b", "a"], maxlen=3)
+        self.assertEqual(seen.to_list(), ["a", "b"])
+        self.assertTrue(seen.add("c"))
+        self.assertFalse(seen.add("b"))
+        self.assertTrue(seen.add("d"))
+        self.assertEqual(seen.to_list(), ["b", "c", "d"])
+        self.assertNotIn("a", seen)
+        self.assertIn("d", seen)
+
+    def test_load_and_store_seen_keys_round_trip(self):
+        ed.configure(
+            {"STRICT_SOURCE": True, "DEDUP_PRICE_DECIMALS": 2, "SEEN_KEYS_MAX": 500},
+            iso_utc=lambda: "2025-01-01T00:00:00+00:00",
+            save_state=lambda st: None,
+            log_event=lambda *a, **k: None,
+            seen_max=2,
+        )
+        meta = {"seen_keys": ["k1"]}
+        seen = ed.load_seen_keys(meta)
+        seen.add("k2")
+        seen.add("k3")
+        ed.store_seen_keys(meta, seen)
+        self.assertEqual(meta["seen_keys"], ["k2", "k3"])
+
+        meta["seen_keys"] = ["x"]  # e.g. state reloaded from disk
+        fresh = ed.load_seen_keys(meta)
+        self.assertIn("x", fresh)
+        self.assertNotIn("k3", fresh)
+
+    def test_bootstrap_keeps_newest_keys_when_capped(self):
+        ed.configure(
+            {"STRICT_SOURCE": True, "DEDUP_PRICE_DECIMALS": 2, "SEEN_KEYS_MAX": 2},
+            iso_utc=lambda: "2025-01-01T00:00:00+00:00",
+            save_state=lambda st: None,
+            log_event=lambda *a, **k: None,
+        )
+        st = {"meta": {"seen_keys": [], "dedup_fp": ed.dedup_fingerprint()}}
+        tail = [
+            json.dumps({"action": "PEAK", "source": "DeltaScout", "kind": "long",
+                        "ts": f"2025-01-01T12:3{i}:00Z", "price": 100.0 + i})
+            for i in range(4)
+        ]
+        ed.bootstrap_seen_keys_from_tail(st, tail)
+        keys = st["meta"]["seen_keys"]
+        self.assertEqual(len(keys), 2)
+        self.assertTrue(keys[0].startswith("PEAK|2025-01-01T12:32|long|102.00"))
+        self.assertTrue(keys[1].startswith("PEAK|2025-01-01T12:33|long|103.00"))
+
+    def test_ts_norm_fast_path_matches_pandas(self):
+        import pandas as pd
+        for ts in ("2025-01-01T12:34:56Z", "2025-01-01 12:34:56.250", "2025-01-01T14:34:56+02:00", "2025-01-01T12:34"):
+            s = ts[:-1] + "+00:00" if ts.endswith("Z") else ts
+            self.assertEqual(ed._ts_norm(ts), pd.to_datetime(s, utc=True).isoformat())
+        # non-ISO input still goes through pandas
+        self.assertEqual(ed._ts_norm("Jan 1 2025 12:34"), "2025-01-01T12:34:00+00:00")
+        self.assertEqual(ed._ts_norm("garbage"), "garbage")
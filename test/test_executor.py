@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+from decimal import Decimal
 from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 import pandas as pd
@@ -95,6 +98,242 @@ class TestExecutorV15(unittest.TestCase):
         self.assertIn(111, called)
         self.assertIn(222, called)
 
+    def test_live_status_batch_reuses_open_orders_snapshot(self):
+        def run(batch_on):
+            st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
+                               "qty": 0.1,
+                               "prices": {"entry": 100, "tp1": 101, "tp2": 102, "sl": 99},
+                               "orders": {"tp1": 111, "tp2": 222, "sl": 333}}}
+            status_calls = []
+
+            def fake_status(_symbol, oid):
+                status_calls.append(int(oid))
+                return {"status": "NEW"}
+
+            # TP1 is listed in openOrders; TP2 is not (e.g. already filled).
+            open_list = [
+                {"orderId": 111, "status": "NEW", "executedQty": "0", "origQty": "0.03"},
+                {"orderId": 333, "status": "NEW", "executedQty": "0", "origQty": "0.1"},
+            ]
+            with patch.dict(executor.ENV, {"LIVE_STATUS_BATCH": batch_on}), \
+                 patch.object(executor, "_now_s", return_value=1000.0), \
+                 patch.object(executor.binance_api, "open_orders", return_value=open_list), \
+                 patch.object(executor.binance_api, "get_mid_price", return_value=100.5), \
+                 patch.object(executor.binance_api, "check_order_status", side_effect=fake_status), \
+                 patch.object(executor, "save_state", lambda *_: None), \
+                 patch.object(executor, "send_webhook", lambda *_: None), \
+                 patch.object(executor, "log_event", lambda *_ , **__: None):
+
+                executor.manage_v15_position(executor.ENV["SYMBOL"], st)
+            return status_calls
+
+        calls_off = run(False)
+        calls_on = run(True)
+
+        self.assertEqual(calls_off.count(111), 1)
+        # TP1 came from the snapshot; TP2 is missing from it and still gets a GET order.
+        self.assertEqual(calls_on.count(111), 0)
+        self.assertEqual(calls_on.count(222), calls_off.count(222))
+
+    def test_tp_watchdog_polls_only_ids_missing_from_open_orders(self):
+        st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
+                           "qty": 0.1,
+                           "prices": {"entry": 100, "tp1": 101, "tp2": 102, "sl": 99},
+                           "orders": {"tp1": 111, "tp2": 222, "sl": 333},
+                           # Main TP1/TP2 polls not due; only the TP watchdog polls run.
+                           "tp1_status_next_s": 2000.0,
+                           "tp2_status_next_s": 2000.0}}
+        status_calls = []
+
+        def fake_status(_symbol, oid):
+            status_calls.append(int(oid))
+            return {"orderId": int(oid), "status": "NEW", "executedQty": "0", "origQty": "0.03"}
+
+        # TP1 is in this tick's openOrders snapshot; TP2 is not.
+        open_list = [
+            {"orderId": 111, "status": "NEW", "executedQty": "0", "origQty": "0.03"},
+            {"orderId": 333, "status": "NEW", "executedQty": "0", "origQty": "0.1"},
+        ]
+        with patch.object(executor, "_now_s", return_value=1000.0), \
+             patch.object(executor.binance_api, "open_orders", return_value=open_list), \
+             patch.object(executor.binance_api, "get_mid_price", return_value=100.5), \
+             patch.object(executor.binance_api, "check_order_status", side_effect=fake_status), \
+             patch.object(executor, "save_state", lambda *_: None), \
+             patch.object(executor, "send_webhook", lambda *_: None), \
+             patch.object(executor, "log_event", lambda *_ , **__: None):
+
+            executor.manage_v15_position(executor.ENV["SYMBOL"], st)
+
+        self.assertEqual(status_calls.count(111), 0)
+        self.assertEqual(status_calls.count(222), 1)
+
+    def test_cancel_ignore_unknown_uses_structured_error_code(self):
+        with patch.object(executor.binance_api, "cancel_order", side_effect=executor.binance_api.BinanceAPIError(400, '{"code":-2011,"msg":"Unknown order"}')):
+            self.assertIsNone(executor._cancel_ignore_unknown("BTCUSDC", 5))
+        # A bare message mentioning -2011 is not a Binance error response.
+        bare = Exception('{"code":-2011}')
+        with patch.object(executor.binance_api, "cancel_order", side_effect=bare):
+            self.assertIs(executor._cancel_ignore_unknown("BTCUSDC", 5), bare)
+        boom = Exception("timeout")
+        with patch.object(executor.binance_api, "cancel_order", side_effect=boom):
+            self.assertIs(executor._cancel_ignore_unknown("BTCUSDC", 5), boom)
+        self.assertTrue(executor._is_unknown_order_error(Exception("Order does not exist.")))
+
+    def test_order_reject_classifiers_prefer_structured_code(self):
+        api_err = executor.binance_api.BinanceAPIError
+        self.assertTrue(executor._is_limit_maker_reject(api_err(400, '{"code":-2010,"msg":"Order would immediately match"}')))
+        self.assertTrue(executor._is_limit_maker_reject(Exception("code: -2010")))
+        self.assertFalse(executor._is_limit_maker_reject(Exception("timeout")))
+        self.assertTrue(executor._is_duplicate_client_order_id_error(api_err(400, '{"code":-2010,"msg":"rejected"}')))
+        self.assertTrue(executor._is_duplicate_client_order_id_error(Exception('{"code": -1015}')))
+        # A bare -2010 in a message is a generic reject, not a duplicate clientOrderId.
+        self.assertFalse(executor._is_duplicate_client_order_id_error(Exception('{"code":-2010}')))
+
+    def test_note_not_filled_once_per_key_and_bounded(self):
+        pos = {}
+        self.assertTrue(executor._note_not_filled(pos, "sl:1"))
+        self.assertFalse(executor._note_not_filled(pos, "sl:1"))
+        for i in range(2, 40):
+            executor._note_not_filled(pos, f"sl:{i}")
+        miss = pos["missing_not_filled"]
+        self.assertEqual(len(miss), executor._MISSING_NOT_FILLED_MAX)
+        self.assertNotIn("sl:1", miss)
+        self.assertIn("sl:39", miss)
+
+    def test_exit_client_id_unique_within_one_second(self):
+        with patch.object(executor.time, "time", return_value=1_700_000_000.0):
+            a = executor._exit_client_id("EX_SL_TR_RESTORE")
+            b = executor._exit_client_id("EX_SL_TR_RESTORE")
+        self.assertNotEqual(a, b)
+        self.assertTrue(a.startswith("EX_SL_TR_RESTORE_"))
+        self.assertTrue(a.endswith("_1700000000"))
+        self.assertLessEqual(len(a), 36)
+
+    def test_pos_exit_side_stored_or_derived(self):
+        self.assertEqual(executor._pos_exit_side({"side": "SHORT", "exit_side": "BUY"}), "BUY")
+        legacy = {"side": "LONG"}
+        self.assertEqual(executor._pos_exit_side(legacy), "SELL")
+        self.assertEqual(legacy["exit_side"], "SELL")
+        unknown = {"side": "UNKNOWN"}
+        self.assertEqual(executor._pos_exit_side(unknown), "BUY")
+        self.assertNotIn("exit_side", unknown)
+
+    def test_update_order_fill_monotonic_with_average(self):
+        pos = {"orders": {"tp1": 111}}
+        self.assertTrue(executor._update_order_fill(pos, "tp1", {
+            "status": "PARTIALLY_FILLED", "executedQty": "0.002", "cummulativeQuoteQty": "200.0"}))
+        leg = pos["orders"]["fills"]["tp1"]
+        self.assertEqual((leg["orderId"], leg["executedQty"], leg["avgFillPrice"]), (111, 0.002, 100000.0))
+        # Stale (smaller) payload does not move the fill backwards.
+        self.assertFalse(executor._update_order_fill(pos, "tp1", {
+            "status": "PARTIALLY_FILLED", "executedQty": "0.001", "cummulativeQuoteQty": "100.0"}))
+        self.assertTrue(executor._update_order_fill(pos, "tp1", {
+            "status": "FILLED", "executedQty": "0.004", "cummulativeQuoteQty": "404.0"}))
+        self.assertEqual(leg["avgFillPrice"], 101000.0)
+
+    def test_fill_float_passes_floats_and_rejects_junk(self):
+        self.assertEqual(executor._fill_float(0.25), 0.25)
+        self.assertEqual(executor._fill_float("0.0030"), 0.003)
+        self.assertEqual(executor._fill_float(3), 3.0)
+        self.assertIsNone(executor._fill_float(None))
+        self.assertIsNone(executor._fill_float("n/a"))
+
+    def test_bookkeeping_saves_coalesced_into_one_write_per_tick(self):
+        st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
+                           "qty": 0.1,
+                           "prices": {"entry": 100, "tp1": 101, "tp2": 102, "sl": 99},
+                           "orders": {"tp1": 111, "tp2": 222, "sl": 333}}}
+        open_list = [{"orderId": 111}, {"orderId": 222}, {"orderId": 333}]
+        saves = []
+
+        with patch.object(executor, "_now_s", return_value=1000.0), \
+             patch.object(executor.binance_api, "open_orders", return_value=open_list), \
+             patch.object(executor.binance_api, "check_order_status", return_value={"status": "NEW"}), \
+             patch.object(executor.binance_api, "get_mid_price", return_value=100.5), \
+             patch.object(executor.emergency, "save_state_safe", side_effect=lambda _st, where: saves.append(where)), \
+             patch.object(executor, "save_state", lambda *_: None), \
+             patch.object(executor, "send_webhook", lambda *_: None), \
+             patch.object(executor, "log_event", lambda *_ , **__: None):
+
+            executor.manage_v15_position(executor.ENV["SYMBOL"], st)
+
+        self.assertEqual(len(saves), 1)
+        self.assertEqual(st["position"]["tp2_status_next_s"], 1000.0 + float(executor.ENV["LIVE_STATUS_POLL_EVERY"]))
+
+    def test_direct_save_absorbs_deferred_bookkeeping(self):
+        st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
+                           "qty": 0.1,
+                           "prices": {"entry": 100, "tp1": 101, "tp2": 102, "sl": 99},
+                           "orders": {"tp1": 111, "tp2": 222, "sl": 333,
+                                      "qty1": 0.03, "qty2": 0.03, "qty3": 0.04},
+                           "tp1_done": True}}
+        open_list = [{"orderId": 333}]
+        deferred_flushes = []
+        direct_saves = []
+        fake_status = lambda _sym, oid: {"status": "FILLED" if int(oid) == 222 else "NEW"}
+
+        with patch.dict(executor.ENV, {"TRAIL_ACTIVATE_AFTER_TP2": False}), \
+             patch.object(executor, "_now_s", return_value=1000.0), \
+             patch.object(executor.binance_api, "open_orders", return_value=open_list), \
+             patch.object(executor.binance_api, "check_order_status", side_effect=fake_status), \
+             patch.object(executor.binance_api, "get_mid_price", return_value=100.5), \
+             patch.object(executor.emergency, "save_state_safe", side_effect=lambda _st, where: deferred_flushes.append(where)), \
+             patch.object(executor, "save_state", side_effect=lambda _st: direct_saves.append(1)), \
+             patch.object(executor, "send_webhook", lambda *_: None), \
+             patch.object(executor, "log_event", lambda *_ , **__: None):
+
+            executor.manage_v15_position(executor.ENV["SYMBOL"], st)
+
+        self.assertTrue(st["position"]["tp2_done"])
+        self.assertGreaterEqual(len(direct_saves), 1)
+        # tp2_status_next_s was deferred first; the TP2_DONE save already persisted it.
+        self.assertEqual(deferred_flushes, [])
+
+    def test_tp1_be_uses_cancel_replace_on_spot_when_enabled(self):
+        st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
+                           "qty": 0.1,
+                           "prices": {"entry": 100, "tp1": 101, "tp2": 102, "sl": 99},
+                           "orders": {"tp1": 111, "tp2": 222, "sl": 444},
+                           "tp1_done": True,
+                           "tp1_be_pending": True,
+                           "tp1_be_next_s": 0.0,
+                           "tp1_be_exit_side": "SELL",
+                           "tp1_be_stop": 100.0,
+                           "tp1_be_rem_qty": 0.05,
+                           "tp1_be_old_sl": 444,
+                           "tp1_be_source": "TP1"}}
+        status_calls = []
+
+        def fake_status(_symbol, oid):
+            status_calls.append(int(oid))
+            return {"status": "NEW"}
+
+        open_list = [{"orderId": 222}, {"orderId": 444}]
+        cr = MagicMock(return_value={"orderId": 555})
+        with patch.dict(executor.ENV, {"SL_CANCEL_REPLACE": True, "TRADE_MODE": "spot"}), \
+             patch.object(executor, "_now_s", return_value=1000.0), \
+             patch.object(executor.binance_api, "open_orders", return_value=open_list), \
+             patch.object(executor.binance_api, "cancel_replace_order", cr), \
+             patch.object(executor.binance_api, "cancel_order", MagicMock()) as m_cancel, \
+             patch.object(executor.binance_api, "place_order_raw", MagicMock()) as m_place, \
+             patch.object(executor.binance_api, "check_order_status", side_effect=fake_status), \
+             patch.object(executor.binance_api, "get_mid_price", return_value=100.5), \
+             patch.object(executor, "save_state", lambda *_: None), \
+             patch.object(executor, "send_webhook", lambda *_: None), \
+             patch.object(executor, "log_event", lambda *_ , **__: None):
+
+            executor.manage_v15_position(executor.ENV["SYMBOL"], st)
+
+        cr.assert_called_once()
+        self.assertEqual(cr.call_args[0][1], 444)
+        self.assertEqual(cr.call_args[0][2]["type"], "STOP_LOSS_LIMIT")
+        self.assertNotIn(444, [c.args[1] for c in m_cancel.call_args_list])
+        # Only the regular SL poll touches the old id; no separate cancel-confirmation probe.
+        self.assertEqual(status_calls.count(444), 1)
+        m_place.assert_not_called()
+        self.assertEqual(st["position"]["orders"]["sl"], 555)
+        self.assertNotIn("tp1_be_pending", st["position"])
+
     def test_sl_filled_closes_even_when_exit_cleanup_pending(self):
         st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
                            "qty": 0.1,
@@ -204,6 +443,39 @@ class TestExecutorV15(unittest.TestCase):
         self.assertIn(111, called)
         self.assertGreaterEqual(m_place.call_count, 1)
 
+    def test_tp2_close_cancels_all_open_orders_in_one_call(self):
+        def _run(flag):
+            st = {"position": {"mode": "live", "status": "OPEN", "side": "LONG",
+                               "qty": 0.1,
+                               "prices": {"entry": 100, "tp1": 101, "tp2": 102, "sl": 99},
+                               "orders": {"tp1": 111, "tp2": 222, "sl": 333,
+                                          "qty1": 0.05, "qty2": 0.05, "qty3": 0.0},
+                               "tp1_done": True}}
+            fake_status = lambda _sym, oid: {"status": "FILLED" if int(oid) == 222 else "NEW"}
+            with patch.dict(executor.ENV, {"CLOSE_CANCEL_ALL_OPEN": flag, "TRAIL_ACTIVATE_AFTER_TP2": False}), \
+                 patch.object(executor, "_now_s", return_value=1000.0), \
+                 patch.object(executor.binance_api, "open_orders", side_effect=Exception("boom")), \
+                 patch.object(executor.binance_api, "check_order_status", side_effect=fake_status), \
+                 patch.object(executor.binance_api, "get_mid_price", return_value=100.5), \
+                 patch.object(executor.binance_api, "cancel_all_open_orders", MagicMock(return_value=[])) as m_all, \
+                 patch.object(executor.binance_api, "cancel_order", MagicMock()) as m_cancel, \
+                 patch.object(executor, "save_state", lambda *_: None), \
+                 patch.object(executor, "send_webhook", lambda *_: None), \
+                 patch.object(executor, "send_trade_closed", lambda *_, **__: None), \
+                 patch.object(executor, "log_event", lambda *_ , **__: None):
+                executor.manage_v15_position(executor.ENV["SYMBOL"], st)
+            self.assertIsNone(st["position"])
+            self.assertEqual(st["last_closed"]["reason"], "TP2")
+            return m_all, m_cancel
+
+        m_all, m_cancel = _run(True)
+        m_all.assert_called_once_with(executor.ENV["SYMBOL"])
+        m_cancel.assert_not_called()
+
+        m_all, m_cancel = _run(False)
+        m_all.assert_not_called()
+        self.assertEqual(sorted(c.args[1] for c in m_cancel.call_args_list), [111, 222, 333])
+
     def test_tp2_gate_missing_zone_notice_once(self):
         st = {
             "position": {
@@ -1380,4 +1652,263 @@ class TestExecutorV15(unittest.TestCase):
         
         # Should have logged attach event
         attach_logs = [e for e in logged_events if e[0] and "EXIT_ORDER_ATTACH" in e[0]]
-        self.assertEqual(len(attach_logs), 1)
\ No newline at end of file
+        self.assertEqual(len(attach_logs), 1)
+
+    def test_read_tail_lines_spans_multiple_blocks(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "tail.log")
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(3000):
+                    f.write(f"line-{i:05d}\n")
+            self.assertEqual(
+                executor.read_tail_lines(path, 3),
+                ["line-02997", "line-02998", "line-02999"],
+            )
+            tail = executor.read_tail_lines(path, 2500)
+            self.assertEqual(len(tail), 2500)
+            self.assertEqual(tail[0], "line-00500")
+            self.assertEqual(executor.read_tail_lines(path, 0), [])
+            self.assertEqual(executor.read_tail_lines(os.path.join(td, "missing.log"), 5), [])
+
+    def test_read_new_lines_returns_only_appended_complete_lines(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "deltascout.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("a\nb\nc\n")
+            # First call behaves like a bounded tail
+            self.assertEqual(executor.read_new_lines(path, 2), ["b", "c"])
+            self.assertEqual(executor.read_new_lines(path, 2), [])
+            # Idle file: answered from stat() alone, never opened
+            with patch("builtins.open", side_effect=AssertionError("idle poll opened the file")):
+                self.assertEqual(executor.read_new_lines(path, 2), [])
+
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("d\ne-partial")
+            self.assertEqual(executor.read_new_lines(path, 10), ["d"])
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("-done\n")
+            self.assertEqual(executor.read_new_lines(path, 10), ["e-partial-done"])
+
+            # Truncation resets to a bounded tail of the new content
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x\n")
+            self.assertEqual(executor.read_new_lines(path, 10), ["x"])
+
+    def test_read_tail_lines_incremental_append_and_rewrite(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "aggregated.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("h\n1\n2\n3")
+            self.assertEqual(executor.read_tail_lines(path, 3), ["1", "2", "3"])
+
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n4\n")
+            self.assertEqual(executor.read_tail_lines(path, 3), ["2", "3", "4"])
+            self.assertEqual(executor.read_tail_lines(path, 2), ["3", "4"])
+            # Larger N than remembered -> rescan
+            self.assertEqual(executor.read_tail_lines(path, 5), ["h", "1", "2", "3", "4"])
+
+            # Rewritten in place and regrown past the old offset
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("h\nAAAAAAAAAAAA\nB\n")
+            self.assertEqual(executor.read_tail_lines(path, 2), ["AAAAAAAAAAAA", "B"])
+
+    @staticmethod
+    def _rewrite_in_place(path, text, bump_sec):
+        st = os.stat(path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # mtime advances between writer ticks; pin it so coarse fs timestamps can't hide the rewrite
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_sec * 1_000_000_000))
+
+    def test_read_new_lines_detects_rewrite_in_place(self):
+        with tempfile.TemporaryDirectory() as td:
+            # capped DeltaScout log: oldest PEAK evicted, equal-length PEAK appended
+            log = os.path.join(td, "deltascout.log")
+            peaks = [f'{{"action":"PEAK","i":{i}}}\n' for i in range(5)]
+            with open(log, "w", encoding="utf-8") as f:
+                f.write("".join(peaks))
+            self.assertEqual(len(executor.read_new_lines(log, 80)), 5)
+            size0 = os.path.getsize(log)
+            self._rewrite_in_place(log, "".join(peaks[1:] + ['{"action":"PEAK","i":9}\n']), 1)
+            self.assertEqual(os.path.getsize(log), size0)
+            self.assertIn('{"action":"PEAK","i":9}', executor.read_new_lines(log, 80))
+
+            # regrown past the old offset with a newline right before it, different content
+            path = os.path.join(td, "tail.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("a\nb\n")
+            self.assertEqual(executor.read_new_lines(path, 3), ["a", "b"])
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x\ny\nz\n")
+            self.assertEqual(executor.read_new_lines(path, 3), ["x", "y", "z"])
+
+    def test_read_tail_lines_detects_same_size_rewrite_in_place(self):
+        with tempfile.TemporaryDirectory() as td:
+            # aggregated.csv sliding window: drop oldest row, append one of equal width
+            agg = os.path.join(td, "aggregated.csv")
+            rows = [f"2025-01-01 10:{m:02d}:00,100.{m:02d}\n" for m in range(10)]
+            with open(agg, "w", encoding="utf-8") as f:
+                f.write("h\n" + "".join(rows))
+            self.assertEqual(executor.read_tail_lines(agg, 3)[-1], "2025-01-01 10:09:00,100.09")
+            size0 = os.path.getsize(agg)
+            for k in range(10, 13):
+                rows = rows[1:] + [f"2025-01-01 10:{k:02d}:00,100.{k:02d}\n"]
+                self._rewrite_in_place(agg, "h\n" + "".join(rows), k)
+                self.assertEqual(os.path.getsize(agg), size0)
+                self.assertEqual(executor.read_tail_lines(agg, 3), [r.strip() for r in rows[-3:]])
+
+            # regrown past the old offset with a newline right before it, different content
+            path = os.path.join(td, "tail.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("a\nb\n")
+            self.assertEqual(executor.read_tail_lines(path, 3), ["a", "b"])
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x\ny\nz\n")
+            self.assertEqual(executor.read_tail_lines(path, 3), ["x", "y", "z"])
+
+    def test_validate_exit_plan_tick_alignment(self):
+        keys = ("TICK_SIZE", "MIN_NOTIONAL", "MIN_QTY", "QTY_STEP")
+        prev = {k: executor.ENV.get(k) for k in keys}
+        try:
+            executor.ENV.update(TICK_SIZE=Decimal("0.01"), MIN_NOTIONAL=0, MIN_QTY=Decimal("0.00001"), QTY_STEP=Decimal("0.00001"))
+            # float noise within 1e-6 tick is snapped to the exact tick
+            out = executor.validate_exit_plan(
+                "BTCUSDC", "LONG", 0.003,
+                {"sl": 72656.26, "entry": 72706.26000000001, "tp1": 72756.26, "tp2": 72796.26},
+            )
+            self.assertEqual(out["prices"]["entry"], 72706.26)
+            # exactly at the tolerance edge is still accepted
+            out = executor.validate_exit_plan(
+                "BTCUSDC", "SHORT", 0.003,
+                {"sl": 101.0, "entry": 100.00000001, "tp1": 99.0, "tp2": 98.0},
+            )
+            self.assertEqual(out["prices"]["entry"], 100.0)
+            with self.assertRaisesRegex(RuntimeError, "not aligned to tick"):
+                executor.validate_exit_plan(
+                    "BTCUSDC", "LONG", 0.003,
+                    {"sl": 99.0, "entry": 100.005, "tp1": 101.0, "tp2": 102.0},
+                )
+            with self.assertRaisesRegex(RuntimeError, "not aligned to tick"):
+                executor.validate_exit_plan(
+                    "BTCUSDC", "LONG", 0.003,
+                    {"sl": 99.0, "entry": 100.0000000101, "tp1": 101.0, "tp2": 102.0},
+                )
+        finally:
+            executor.ENV.update(prev)
+
+    def test_split_symbol_guess(self):
+        prev = executor.ENV.get("PREFLIGHT_EXPECT_QUOTE")
+        try:
+            executor.ENV["PREFLIGHT_EXPECT_QUOTE"] = ""
+            self.assertEqual(executor._split_symbol_guess("btcusdc"), ("BTC", "USDC"))
+            self.assertEqual(executor._split_symbol_guess("BTCFDUSD"), ("BTC", "FDUSD"))
+            self.assertEqual(executor._split_symbol_guess("ETHBTC"), ("ETH", "BTC"))
+            self.assertEqual(executor._split_symbol_guess("TUSD"), ("TUSD", ""))
+            self.assertEqual(executor._split_symbol_guess(""), ("", ""))
+            self.assertEqual(executor._split_symbol_guess("XYZABC"), ("XYZABC", ""))
+            # expected quote is part of the cache key
+            executor.ENV["PREFLIGHT_EXPECT_QUOTE"] = "ABC"
+            self.assertEqual(executor._split_symbol_guess("XYZABC"), ("XYZ", "ABC"))
+        finally:
+            executor.ENV["PREFLIGHT_EXPECT_QUOTE"] = prev
+
+    def test_exchange_position_exists_uses_bound_account_fn(self):
+        prev = {k: executor.ENV.get(k) for k in ("TRADE_MODE", "MIN_QTY", "PREFLIGHT_EXPECT_QUOTE")}
+        try:
+            executor.ENV.update({"TRADE_MODE": "margin", "MIN_QTY": 0.00001, "PREFLIGHT_EXPECT_QUOTE": ""})
+            self.assertEqual(executor._MARGIN_ACCT_FN, "margin_account")
+            payload = {"userAssets": [{"asset": "BTC", "free": "0.01", "locked": "0", "borrowed": "0", "interest": "0", "netAsset": "0.01"}]}
+            with patch.object(executor.binance_api, "margin_account", return_value=payload) as acct:
+                self.assertTrue(executor._exchange_position_exists("BTCUSDC"))
+                acct.assert_called_once_with()
+            payload["userAssets"][0].update({"free": "0", "netAsset": "0"})
+            with patch.object(executor.binance_api, "margin_account", return_value=payload):
+                self.assertFalse(executor._exchange_position_exists("BTCUSDC"))
+
+            executor.ENV["TRADE_MODE"] = "spot"
+            with patch.object(executor, "_SPOT_ACCT_FN", None):
+                self.assertIsNone(executor._exchange_position_exists("BTCUSDC"))
+        finally:
+            executor.ENV.update(prev)
+
+    def test_entry_price_and_qty_helpers_follow_env(self):
+        keys = ("TICK_SIZE", "ENTRY_OFFSET_USD", "QTY_STEP", "MIN_QTY", "MIN_NOTIONAL")
+        prev = {k: executor.ENV.get(k) for k in keys}
+        try:
+            executor.ENV.update({
+                "TICK_SIZE": Decimal("0.01"), "ENTRY_OFFSET_USD": 0.005,
+                "QTY_STEP": Decimal("0.00001"), "MIN_QTY": Decimal("0.00001"), "MIN_NOTIONAL": 5.0,
+            })
+            # offset below one tick -> at least one tick away from close
+            self.assertAlmostEqual(executor.build_entry_price("long", 100.0), 100.01)
+            self.assertAlmostEqual(executor.build_entry_price("short", 100.0), 99.99)
+            executor.ENV["ENTRY_OFFSET_USD"] = 1.234
+            self.assertAlmostEqual(executor.build_entry_price("long", 100.0), 101.23)
+            self.assertAlmostEqual(executor.build_entry_price("short", 100.0), 98.77)
+
+            self.assertAlmostEqual(executor.notional_to_qty(50000.0, 100.0), 0.002)
+            self.assertEqual(executor.notional_to_qty(0.0, 100.0), 0.0)
+            self.assertTrue(executor.validate_qty(0.002, 50000.0))
+            self.assertFalse(executor.validate_qty(0.000001, 50000.0))
+            self.assertFalse(executor.validate_qty(0.00001, 100.0))
+        finally:
+            executor.ENV.update(prev)
+
+    def test_compute_tps_directional_rounding(self):
+        prev = {k: executor.ENV.get(k) for k in ("TICK_SIZE", "TP_R_LIST")}
+        try:
+            executor.ENV.update({"TICK_SIZE": Decimal("0.01"), "TP_R_LIST": [1.0, 2.0]})
+            self.assertEqual(executor.compute_tps(100.0, 99.333, "BUY"), [100.66, 101.33])
+            self.assertEqual(executor.compute_tps(100.0, 100.667, "SELL"), [99.34, 98.67])
+            self.assertEqual(executor.compute_tps(100.0, 100.0, "BUY"), [])
+        finally:
+            executor.ENV.update(prev)
+
+    def test_planb_market_allowed_follows_env_overrides(self):
+        posi = {"side": "LONG", "prices": {"entry": 100.0, "sl": 99.0, "tp1": 101.0}}
+        limits = {"PLANB_MAX_DEV_R_MULT": 0.25, "PLANB_MAX_DEV_USD": 0.0, "PLANB_ABORT_IF_PAST_TP1": True}
+        with patch.dict(executor.ENV, limits):
+            self.assertEqual(executor._planb_market_allowed(posi, 100.2)[:2], (True, "ok"))
+            self.assertEqual(executor._planb_market_allowed(posi, 100.3)[:2], (False, "deviation_too_large"))
+            executor.ENV["PLANB_MAX_DEV_R_MULT"] = 0.0
+            self.assertEqual(executor._planb_market_allowed(posi, 101.0)[:2], (False, "past_tp1"))
+            executor.ENV["PLANB_ABORT_IF_PAST_TP1"] = False
+            self.assertEqual(executor._planb_market_allowed(posi, 101.0)[:2], (True, "ok"))
+            executor.ENV.update({"PLANB_MAX_DEV_R_MULT": 0.25, "PLANB_MAX_DEV_USD": 0.5})
+            self.assertEqual(executor._planb_market_allowed(posi, 100.4)[:2], (True, "ok"))
+
+    def test_env_helpers_read_snapshot_and_reload_env(self):
+        src = {"X_INT": "7", "X_BAD": "nope", "X_BOOL": " Yes ", "X_STR": "  "}
+        self.assertEqual(executor._get_int("X_INT", 1, src), 7)
+        self.assertEqual(executor._get_int("X_BAD", 3, src), 3)
+        self.assertEqual(executor._get_float("X_MISSING", 1.5, src), 1.5)
+        self.assertTrue(executor._get_bool("X_BOOL", False, src))
+        self.assertEqual(executor._get_str("X_STR", "dflt", src), "dflt")
+
+        prev = dict(executor.ENV)
+        env_ref = executor.ENV
+        try:
+            with patch.dict(os.environ, {"COOLDOWN_SEC": "42"}, clear=False):
+                # snapshot is taken once; later environ changes need reload_env()
+                self.assertNotEqual(executor._get_int("COOLDOWN_SEC", 180), 42)
+                self.assertIs(executor.reload_env(), env_ref)
+                self.assertEqual(executor.ENV["COOLDOWN_SEC"], 42)
+        finally:
+            executor.ENV.clear()
+            executor.ENV.update(prev)
+            executor._ENVSNAP = dict(os.environ)
+
+    def test_read_tail_lines_large_file_matches_full_read(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "big.log")
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(20000):
+                    f.write(f"{{\"i\":{i}}}\n")
+                f.write("partial")
+            self.assertGreater(os.path.getsize(path), executor._TAIL_MMAP_MIN)
+            with open(path, "r", encoding="utf-8") as f:
+                expected = f.read().splitlines()
+            for n in (1, 80, 19999, 30000):
+                executor._TAIL_STATE.pop(path, None)
+                self.assertEqual(executor.read_tail_lines(path, n), expected[-n:])
@@ -0,0 +1,51 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import executor_mod.json_codec as json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    SAMPLE = {
+        "ts": datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc),
+        "price": Decimal("100.10"),
+        "qty": 0.001,
+        "n": 3,
+        "ok": True,
+        "note": "ціна",
+        "ids": (1, 2),
+        5: None,
+    }
+
+    def _expected(self) -> str:
+        return json.dumps(self.SAMPLE, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def test_dumps_matches_stdlib_output(self):
+        self.assertEqual(json_codec.dumps(self.SAMPLE), self._expected())
+
+    def test_dumps_stdlib_fallback_without_orjson(self):
+        with patch.object(json_codec, "orjson", None):
+            self.assertEqual(json_codec.dumps(self.SAMPLE), self._expected())
+
+    def test_dumps_falls_back_for_big_ints(self):
+        self.assertEqual(json_codec.dumps({"x": 2 ** 70}), '{"x":%d}' % 2 ** 70)
+
+    def test_loads_accepts_str_and_bytes(self):
+        line = '{"action":"PEAK","price":100.5,"kind":"long","note":"ціна"}'
+        expected = json.loads(line)
+        self.assertEqual(json_codec.loads(line), expected)
+        self.assertEqual(json_codec.loads(line.encode("utf-8")), expected)
+        with patch.object(json_codec, "orjson", None):
+            self.assertEqual(json_codec.loads(line), expected)
+
+    def test_loads_stdlib_compat_and_errors(self):
+        self.assertTrue(json_codec.loads('{"x": NaN}')["x"] != json_codec.loads('{"x": NaN}')["x"])
+        self.assertEqual(json_codec.loads('{"x": %d}' % 2 ** 70), {"x": 2 ** 70})
+        with self.assertRaises(ValueError):
+            json_codec.loads("{not json")
+
+
+if __name__ == "__main__":
+    unittest.main()
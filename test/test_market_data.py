@@ -61,3 +61,38 @@ class TestMarketData(unittest.TestCase):
 
             idx = market_data.locate_index_by_ts(df, datetime(2026, 1, 1, 10, 1, 0))
             self.assertEqual(idx, 1)
+
+    def test_load_df_sorted_reuses_parse_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "aggregated.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("Timestamp,Trades,TotalQty,AvgSize,BuyQty,SellQty,AvgPrice,ClosePrice\n")
+                f.write("2026-01-01 10:00:00,1,1,1,1,0,90,91\n")
+
+            market_data.configure({"AGG_CSV": path})
+            df1 = market_data.load_df_sorted()
+            df2 = market_data.load_df_sorted()
+            self.assertIs(df1, df2)
+
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("2026-01-01 10:01:00,1,1,1,1,0,95,96\n")
+            df3 = market_data.load_df_sorted()
+            self.assertIsNot(df3, df1)
+            self.assertEqual(len(df3), 2)
+            self.assertEqual(float(market_data.latest_price(df3)), 96.0)
+
+    def test_locate_index_by_ts_sub_minute_and_missing(self):
+        df = pd.DataFrame({
+            "Timestamp": pd.to_datetime([
+                "2026-01-01 10:00:00",
+                "2026-01-01 10:01:30",
+                "2026-01-01 10:03:00",
+            ]),
+            "price": [1.0, 2.0, 3.0],
+        })
+        self.assertEqual(market_data.locate_index_by_ts(df, datetime(2026, 1, 1, 10, 1, 59)), 1)
+        # No bar in 10:02 -> falls back to the last index
+        self.assertEqual(market_data.locate_index_by_ts(df, datetime(2026, 1, 1, 10, 2, 0)), 2)
+        self.assertEqual(market_data.locate_index_by_ts(df, datetime(2026, 1, 1, 9, 0, 0)), 2)
+        # Unsorted frames still use the scan
+        self.assertEqual(market_data.locate_index_by_ts(df.iloc[::-1].reset_index(drop=True), datetime(2026, 1, 1, 10, 0, 0)), 2)
@@ -50,6 +50,113 @@ class TestNotifications(unittest.TestCase):
             self.assertEqual(len(lines), 3)
             self.assertEqual([x["i"] for x in lines], [2, 3, 4])
 
+    def test_log_cap_trim_replaces_file_without_leftover_tmp(self):
+        with tempfile.TemporaryDirectory() as td:
+            log_fn = os.path.join(td, "executor.log")
+            n = self._reload_notifications_with_env({
+                "EXEC_LOG": log_fn,
+                "LOG_MAX_LINES": "2",
+                "N8N_WEBHOOK_URL": "",
+            })
+
+            for i in range(4):
+                n.log_event("E", i=i)
+
+            self.assertEqual(sorted(os.listdir(td)), ["executor.log"])
+            with open(log_fn, "r", encoding="utf-8") as f:
+                self.assertEqual([json.loads(x)["i"] for x in f], [2, 3])
+
+    def test_log_event_recreates_log_removed_under_open_handle(self):
+        with tempfile.TemporaryDirectory() as td:
+            log_fn = os.path.join(td, "executor.log")
+            n = self._reload_notifications_with_env({
+                "EXEC_LOG": log_fn,
+                "LOG_MAX_LINES": "200",
+                "N8N_WEBHOOK_URL": "",
+            })
+
+            n.log_event("A")
+            os.remove(log_fn)
+            n.log_event("B")
+
+            with open(log_fn, "r", encoding="utf-8") as f:
+                self.assertEqual([json.loads(x)["action"] for x in f], ["B"])
+
+    def test_log_cap_trims_below_cap_and_counts_existing_lines(self):
+        with tempfile.TemporaryDirectory() as td:
+            log_fn = os.path.join(td, "executor.log")
+            with open(log_fn, "w", encoding="utf-8") as f:
+                for i in range(6):
+                    f.write(json.dumps({"i": -1}) + "\n")
+            n = self._reload_notifications_with_env({
+                "EXEC_LOG": log_fn,
+                "LOG_MAX_LINES": "8",
+                "N8N_WEBHOOK_URL": "",
+            })
+
+            def _lines():
+                with open(log_fn, "r", encoding="utf-8") as f:
+                    return [json.loads(x)["i"] for x in f]
+
+            for i in range(3):
+                n.log_event("E", i=i)
+            self.assertEqual(_lines(), [-1, -1, -1, 0, 1, 2])  # 9 > cap -> newest 3/4 of cap
+
+            n.log_event("E", i=3)
+            n.log_event("E", i=4)
+            self.assertEqual(_lines(), [-1, -1, -1, 0, 1, 2, 3, 4])  # at cap, no trim
+
+    def test_log_flush_interval_buffers_until_flush(self):
+        with tempfile.TemporaryDirectory() as td:
+            log_fn = os.path.join(td, "executor.log")
+            n = self._reload_notifications_with_env({
+                "EXEC_LOG": log_fn,
+                "LOG_MAX_LINES": "4",
+                "LOG_FLUSH_SEC": "3600",
+                "N8N_WEBHOOK_URL": "",
+            })
+
+            def _lines():
+                with open(log_fn, "r", encoding="utf-8") as f:
+                    return [json.loads(x)["i"] for x in f]
+
+            n.log_event("E", i=0)
+            n.log_event("E", i=1)
+            self.assertEqual(_lines(), [0])  # first write after open is flushed, the rest waits
+            n.flush_logs()
+            self.assertEqual(_lines(), [0, 1])
+
+            for i in range(2, 6):
+                n.log_event("E", i=i)
+            self.assertEqual(_lines(), [2, 3, 4])  # trim flushes before re-reading
+            n.flush_logs()
+            self.assertEqual(_lines(), [2, 3, 4, 5])
+
+    def test_log_flush_interval_buffered_lines_follow_rotation(self):
+        with tempfile.TemporaryDirectory() as td:
+            log_fn = os.path.join(td, "executor.log")
+            n = self._reload_notifications_with_env({
+                "EXEC_LOG": log_fn,
+                "LOG_MAX_LINES": "200",
+                "LOG_FLUSH_SEC": "3600",
+                "N8N_WEBHOOK_URL": "",
+            })
+
+            def _lines(fn):
+                with open(fn, "r", encoding="utf-8") as f:
+                    return [json.loads(x)["i"] for x in f]
+
+            n.log_event("E", i=0)
+            with mock.patch.object(n.os, "stat", wraps=os.stat) as stat:
+                n.log_event("E", i=1)
+                n.log_event("E", i=2)
+            stat.assert_not_called()  # no rotation check between flushes
+
+            os.replace(log_fn, log_fn + ".1")
+            n.flush_logs()
+            self.assertEqual(_lines(log_fn + ".1"), [0])
+            self.assertEqual(_lines(log_fn), [1, 2])
+
     def test_send_webhook_error_logs(self):
         with tempfile.TemporaryDirectory() as td:
             log_fn = os.path.join(td, "executor.log")
@@ -59,7 +166,9 @@ class TestNotifications(unittest.TestCase):
                 "N8N_WEBHOOK_URL": "http://example.invalid/webhook",
             })
 
-            with mock.patch("executor_mod.notifications.requests.post", side_effect=RuntimeError("boom")):
+            session = mock.Mock()
+            session.post.side_effect = RuntimeError("boom")
+            with mock.patch.object(n, "_webhook_session", return_value=session):
                 n.send_webhook({"x": 1})
 
             with open(log_fn, "r", encoding="utf-8") as f:
@@ -67,6 +176,60 @@ class TestNotifications(unittest.TestCase):
 
             self.assertTrue(any(o.get("action") == "WEBHOOK_ERROR" for o in objs))
 
+    def test_send_webhook_reuses_one_session(self):
+        n = self._reload_notifications_with_env({
+            "N8N_WEBHOOK_URL": "http://example.invalid/webhook",
+            "N8N_BASIC_AUTH_USER": "",
+            "N8N_BASIC_AUTH_PASSWORD": "",
+        })
+        session = mock.Mock()
+        with mock.patch.object(n.requests, "Session", return_value=session) as ctor:
+            n.send_webhook({"x": 1})
+            n.send_webhook({"x": 2})
+
+        self.assertEqual(ctor.call_count, 1)
+        self.assertEqual(session.post.call_count, 2)
+        self.assertEqual(session.post.call_args.kwargs["json"], {"x": 2, "source": "executor"})
+
+    def test_send_webhook_async_posts_from_worker(self):
+        n = self._reload_notifications_with_env({
+            "N8N_WEBHOOK_URL": "http://example.invalid/webhook",
+            "N8N_BASIC_AUTH_USER": "",
+            "N8N_BASIC_AUTH_PASSWORD": "",
+            "WEBHOOK_ASYNC": "1",
+        })
+        session = mock.Mock()
+        with mock.patch.object(n, "_webhook_session", return_value=session):
+            n.send_webhook({"x": 1})
+            n.flush_webhooks()
+
+        session.post.assert_called_once()
+        self.assertEqual(session.post.call_args.kwargs["json"], {"x": 1, "source": "executor"})
+        self.assertFalse(n._WH_THREAD.is_alive())
+
+    def test_send_webhook_async_drops_when_queue_full(self):
+        with tempfile.TemporaryDirectory() as td:
+            log_fn = os.path.join(td, "executor.log")
+            n = self._reload_notifications_with_env({
+                "EXEC_LOG": log_fn,
+                "LOG_MAX_LINES": "200",
+                "N8N_WEBHOOK_URL": "http://example.invalid/webhook",
+                "WEBHOOK_ASYNC": "1",
+            })
+            session = mock.Mock()
+            with mock.patch.object(n, "_ensure_webhook_worker"), \
+                 mock.patch.object(n, "_WH_Q", n.queue.Queue(maxsize=1)), \
+                 mock.patch.object(n, "_webhook_session", return_value=session):
+                n.send_webhook({"x": 1})
+                n.send_webhook({"x": 2})
+
+            session.post.assert_not_called()
+            with open(log_fn, "r", encoding="utf-8") as f:
+                objs = [json.loads(x) for x in f.readlines()]
+            dropped = [o for o in objs if o.get("action") == "WEBHOOK_DROPPED"]
+            self.assertEqual(len(dropped), 1)
+            self.assertEqual(dropped[0]["payload"]["x"], 2)
+
     def test_send_trade_closed_emits_once_with_trade_key(self):
         import executor_mod.notifications as n
         st = {}
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import unittest
 from decimal import Decimal, ROUND_HALF_UP, ROUND_FLOOR, ROUND_CEILING
 from typing import Dict, Any, Tuple
 
+import executor_mod.risk_math as risk_math
+
 ENV: Dict[str, Any] = {}
 
 
@@ -75,4 +78,35 @@ def split_qty_3legs(qty_total_r: float) -> Tuple[float, float, float]:
     qty3 = float(Decimal(u3) * step_d)
     if qty1 <= 0 or qty2 <= 0 or qty3 < 0:
         raise RuntimeError(f"Invalid qty split after rounding: qty_total={qty_total_r} qty1={qty1} qty2={qty2} step={ENV.get('QTY_STEP')}")
-    return qty1, qty2, qty3
\ No newline at end of file
+    return qty1, qty2, qty3
+
+
+class TestRiskMathFormatting(unittest.TestCase):
+    def setUp(self):
+        self._old_env = risk_math.ENV
+
+    def tearDown(self):
+        risk_math.configure(self._old_env)
+
+    def test_fmt_follows_env_step_changes(self):
+        env = {"TICK_SIZE": Decimal("0.01"), "QTY_STEP": Decimal("0.00001")}
+        risk_math.configure(env)
+        self.assertEqual(risk_math.fmt_price(100.123), "100.12")
+        self.assertEqual(risk_math.fmt_qty(0.00123), "0.00123")
+
+        env["TICK_SIZE"] = Decimal("0.1")
+        env["QTY_STEP"] = Decimal("0.001")
+        self.assertEqual(risk_math.fmt_price(100.123), "100.1")
+        self.assertEqual(risk_math.fmt_qty(0.0012), "0.001")
+
+    def test_step_rounding_helpers(self):
+        step = Decimal("0.01")
+        self.assertEqual(risk_math.floor_to_step(100.079, step), 100.07)
+        self.assertEqual(risk_math.ceil_to_step(100.071, step), 100.08)
+        self.assertEqual(risk_math.round_nearest_to_step(100.075, step), 100.08)
+        self.assertEqual(risk_math._step_scaled("0.01"), (2, 1))
+        self.assertEqual(risk_math._step_scaled(Decimal("0.5")), (1, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,6 +38,20 @@ class TestStateStore(unittest.TestCase):
                 with open(fn, "r", encoding="utf-8") as f:
                     json.load(f)
 
+    def test_save_state_matches_stdlib_compact_encoding(self):
+        from decimal import Decimal
+        st = {"position": {"status": "OPEN", "qty": 0.003, "tick": Decimal("0.01"),
+                           "orders": {"fills": {"tp1": {"executedQty": 0.001}}}},
+              "meta": {"note": "ціна"}, "cooldown_until": 0.0}
+        with tempfile.TemporaryDirectory() as td:
+            fn = os.path.join(td, "state.json")
+            with mock.patch.dict(os.environ, {"STATE_FN": fn}, clear=False):
+                ss.save_state(st)
+            with open(fn, "r", encoding="utf-8") as f:
+                raw = f.read()
+        self.assertEqual(json.loads(raw), json.loads(json.dumps(st, ensure_ascii=False, separators=(",", ":"), default=str)))
+        self.assertIn("ціна", raw)
+
     def test_has_open_position(self):
         self.assertFalse(ss.has_open_position({"position": None}))
         self.assertTrue(ss.has_open_position({"position": {"status": "PENDING"}}))
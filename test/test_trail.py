@@ -1,5 +1,7 @@
+import os
 import tempfile
 import unittest
+from unittest import mock
 
 import executor_mod.trail as trail
 
@@ -14,7 +16,6 @@ class TestTrailModule(unittest.TestCase):
     def tearDown(self) -> None:
         trail.ENV = self._old_env
         trail.read_tail_lines = self._old_read_tail_lines
-        import os
         for p in self._tmp_paths:
             try:
                 os.remove(p)
@@ -142,5 +143,55 @@ class TestTrailModule(unittest.TestCase):
         pos = {"side": "LONG"}
         self.assertIsNone(trail._trail_desired_stop_from_agg(pos))
 
+    def _bump_mtime(self, path: str) -> None:
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    @mock.patch.object(trail, "_check_agg_header_v2", wraps=trail._check_agg_header_v2)
+    def test_header_check_cached_until_file_changes(self, chk: mock.MagicMock) -> None:
+        rows = [
+            ["2025-01-01 00:00:00", "1", "0.1", "0.1", "0.1", "0", "100.0", "101.0", "101.5", "99.5"],
+        ]
+        path = self._write_agg_csv(rows)
+        self._configure_with_file({})
+        trail._read_last_close_prices_from_agg_csv(path, 1)
+        trail._read_last_low_prices_from_agg_csv(path, 1)
+        self.assertEqual(chk.call_count, 1)
+
+        # Rewritten with a bad header (new mtime) -> FAIL-LOUD again
+        with open(path, "w", newline="") as f:
+            f.write("Timestamp,Foo\n")
+            f.write(",".join(rows[0]) + "\n")
+        self._bump_mtime(path)
+        with self.assertRaises(RuntimeError):
+            trail._read_last_close_prices_from_agg_csv(path, 1)
+
+    @mock.patch.object(trail, "_read_last_low_prices_from_agg_csv",
+                       wraps=trail._read_last_low_prices_from_agg_csv)
+    def test_swing_stop_cached_until_file_changes(self, rd: mock.MagicMock) -> None:
+        rows = [
+            ["2025-01-01 00:00:00", "1", "0.1", "0.1", "0.1", "0", "10.0", "10.0", "10.1", "9.9"],
+            ["2025-01-01 00:01:00", "1", "0.1", "0.1", "0.1", "0", "9.0", "9.0", "9.1", "8.9"],
+            ["2025-01-01 00:02:00", "1", "0.1", "0.1", "0.1", "0", "8.0", "8.0", "8.1", "7.9"],
+            ["2025-01-01 00:03:00", "1", "0.1", "0.1", "0.1", "0", "9.0", "9.0", "9.1", "8.9"],
+            ["2025-01-01 00:04:00", "1", "0.1", "0.1", "0.1", "0", "10.0", "10.0", "10.1", "9.9"],
+        ]
+        path = self._write_agg_csv(rows)
+        self._configure_with_file({"AGG_CSV": path, "TRAIL_SWING_LOOKBACK": 5, "TRAIL_SWING_LR": 2})
+        pos = {"side": "LONG"}
+        self.assertEqual(trail._trail_desired_stop_from_agg(pos), 7.9)
+        self.assertEqual(trail._trail_desired_stop_from_agg(pos), 7.9)
+        self.assertEqual(rd.call_count, 1)
+
+        # Same-size rewrite with a deeper low and a new mtime -> recomputed
+        with open(path, "r+", newline="") as f:
+            body = f.read().replace("8.0,8.1,7.9", "8.0,8.1,7.5")
+            f.seek(0)
+            f.write(body)
+        self._bump_mtime(path)
+        self.assertEqual(trail._trail_desired_stop_from_agg(pos), 7.5)
+        self.assertEqual(rd.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()